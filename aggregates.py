@@ -0,0 +1,83 @@
+"""
+Season-level summaries (team totals, record, leaders, year-over-year change).
+
+Computed once when a snapshot is built and stored on it as
+snapshot.aggregates, so the dashboard, the API and the agent all read the
+same numbers instead of re-summing the tables. Values are plain
+JSON-serialisable Python types; treat them as read-only.
+"""
+import pandas as pd
+
+from instrumentation import timed
+from metrics import outcome_counts, top_performers
+from seasons import CURRENT_SEASON, PREVIOUS_SEASON
+
+
+def _int(value):
+    return int(value) if pd.notna(value) else 0
+
+
+def season_summary(stats, season):
+    """
+    Totals and leaders for one season's {'field_players', 'goalies'} tables
+    """
+    field = stats.get('field_players', pd.DataFrame())
+    goalies = stats.get('goalies', pd.DataFrame())
+    has_field = not field.empty
+    has_goalies = not goalies.empty
+
+    scoring_players = _int((field['Goals'] > 0).sum()) if has_field else 0
+    leaders = [
+        {'player': row['Player'], 'goals': _int(row['Goals']), 'assists': _int(row['Assists'])}
+        for row in (top_performers(field) if has_field else [])
+    ]
+    best_goalkeeper = None
+    if has_goalies:
+        row = goalies.loc[goalies['Saves'].idxmax()]
+        best_goalkeeper = {'player': row['Player'], 'saves': _int(row['Saves']), 'games_played': _int(row['Games Played'])}
+
+    return {
+        'season': season,
+        'goals': _int(field['Goals'].sum()) if has_field else 0,
+        'assists': _int(field['Assists'].sum()) if has_field else 0,
+        'points': _int(field['Points'].sum()) if has_field else 0,
+        'saves': _int(goalies['Saves'].sum()) if has_goalies else 0,
+        'field_players': len(field),
+        'goalkeepers': len(goalies),
+        'players': len(field) + len(goalies),
+        'scoring_players': scoring_players,
+        # percent of field players with at least one goal
+        'scoring_share': round(scoring_players / len(field) * 100) if has_field else 0,
+        'top_performers': leaders,
+        'best_goalkeeper': best_goalkeeper,
+    }
+
+
+def season_record(games):
+    counts = outcome_counts(games['Outcome']) if games is not None and 'Outcome' in games else pd.Series(dtype=int)
+    return {
+        'wins': _int(counts.get('W', 0)),
+        'losses': _int(counts.get('L', 0)),
+        'ties': _int(counts.get('T', 0)),
+        'games': 0 if games is None else len(games),
+    }
+
+
+@timed('aggregates')
+def build_aggregates(data):
+    """
+    {'current': summary, 'previous': summary or None, 'change': {...}, 'record': {...}}
+    for a scrape_all_data result
+    """
+    if not data or not data.get('current_stats'):
+        return {}
+    current = season_summary(data['current_stats'], CURRENT_SEASON)
+    previous = season_summary(data['previous_stats'], PREVIOUS_SEASON) if data.get('previous_stats') else None
+    baseline = previous or {}
+    return {
+        'current': current,
+        'previous': previous,
+        # this season minus last season (last season counts as 0 when missing)
+        'change': {key: current[key] - baseline.get(key, 0) for key in ('goals', 'assists', 'points', 'saves')},
+        'record': season_record((data.get('fixtures') or {}).get('games')),
+    }
@@ -1,38 +1,346 @@
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import json
+import threading
 
-client = Anthropic(api_key="your-key")
-
-def chat_with_data(user_question: str):
-    # Define tools Claude can use
-    tools = [
-        {
-            "name": "get_player_stats",
-            "description": "Get stats for a specific player",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "player_name": {"type": "string"}
-                }
+import config
+import queries
+from answer_cache import AnswerCache, TokenBudget
+from data_store import get_store
+from instrumentation import cache_result
+
+SYSTEM_PROMPT = (
+    "You answer questions about the Edison High School boys soccer team using the tools provided. "
+    "Always look numbers up with a tool instead of guessing, and keep answers short."
+)
+
+# Answer while the first scrape has not produced any data
+NO_DATA_ANSWER = "The team stats haven't loaded yet, try again in a minute."
+
+# Define tools Claude can use
+TOOLS = [
+    {
+        "name": "get_player_stats",
+        "description": "Get this season's stats for a specific player. Misspelled, partial and nick names are fine; "
+                       "a name several players share returns an error listing them as choices.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "player_name": {"type": "string", "description": "Player name as the user wrote it"}
+            },
+            "required": ["player_name"]
+        }
+    },
+    {
+        "name": "get_top_scorers",
+        "description": "Get the team's top goal scorers this season, best first",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "description": "How many players to return", "minimum": 1, "maximum": 100}
             }
-        },
-        {
-            "name": "get_top_scorers",
-            "description": "Get top goal scorers",
-            ...
         }
-    ]
-    
-    # Send to Claude
-    response = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=4096,
-        tools=tools,
-        messages=[{
-            "role": "user", 
-            "content": user_question
-        }]
-    )
-    
-    # Handle tool calls (Claude asking for data)
-    # Return final answer
+    },
+    {
+        "name": "get_team_summary",
+        "description": "Get team totals for this season and last (goals, assists, saves, player counts), "
+                       "the win-loss-tie record, the top performers and the change since last season",
+        "input_schema": {"type": "object", "properties": {}}
+    },
+    {
+        "name": "get_opponent_info",
+        "description": "Get this season's games and record against an opponent",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "team_name": {"type": "string", "description": "Opponent school name"}
+            },
+            "required": ["team_name"]
+        }
+    }
+]
+
+# The system prompt and tool definitions never change, so mark them for
+# prompt caching; later calls read that prefix from cache instead of
+# paying for it again
+CACHED_SYSTEM = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+CACHED_TOOLS = TOOLS[:-1] + [{**TOOLS[-1], "cache_control": {"type": "ephemeral"}}]
+
+# Tool name -> in-process query over a snapshot (no HTTP hop to api.py)
+TOOL_FUNCTIONS = {
+    "get_player_stats": lambda snapshot, args: queries.player_stats(snapshot, args["player_name"]),
+    "get_top_scorers": lambda snapshot, args: queries.top_scorers(snapshot, int(args.get("limit", 5))),
+    "get_team_summary": lambda snapshot, args: queries.team_summary(snapshot),
+    "get_opponent_info": lambda snapshot, args: queries.opponent_info(snapshot, args["team_name"]),
+}
+
+_client = None
+_async_client = None
+_answers = AnswerCache()
+_budget = TokenBudget()
+_tool_cache = {}
+_tool_cache_version = None
+_tool_cache_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = Anthropic()
+    return _client
+
+
+def get_async_client():
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncAnthropic()
+    return _async_client
+
+
+def run_tool(snapshot, name, args):
+    """
+    Runs one tool call, memoised per snapshot version.
+    Returns (result, is_error).
+    """
+    global _tool_cache, _tool_cache_version
+    key = (name, json.dumps(args, sort_keys=True))
+    with _tool_cache_lock:
+        if _tool_cache_version != snapshot.version:
+            _tool_cache = {}
+            _tool_cache_version = snapshot.version
+        if key in _tool_cache:
+            return _tool_cache[key]
+    
+    if name not in TOOL_FUNCTIONS:
+        return {"error": f"Unknown tool {name}"}, True
+    try:
+        result = TOOL_FUNCTIONS[name](snapshot, args)
+    except queries.AmbiguousName as e:
+        # Let the model ask which one was meant instead of answering for a guess
+        outcome = ({"error": str(e), "choices": e.choices}, True)
+    except (KeyError, TypeError, ValueError) as e:
+        return {"error": f"Bad arguments for {name}: {e}"}, True
+    else:
+        outcome = ({"error": "No matching data found"}, True) if result is None else (result, False)
+    with _tool_cache_lock:
+        if _tool_cache_version == snapshot.version:
+            _tool_cache[key] = outcome
+    return outcome
+
+
+def run_tools(snapshot, tool_uses):
+    """
+    Runs every tool call from one model turn, concurrently when there are several,
+    and returns the matching tool_result blocks in order
+    """
+    def run(block):
+        result, is_error = run_tool(snapshot, block.name, block.input or {})
+        return {
+            "type": "tool_result",
+            "tool_use_id": block.id,
+            "content": json.dumps(result),
+            "is_error": is_error
+        }
+    
+    if len(tool_uses) == 1:
+        return [run(tool_uses[0])]
+    with ThreadPoolExecutor(max_workers=len(tool_uses)) as pool:
+        return list(pool.map(run, tool_uses))
+
+
+def response_text(response):
+    return "".join(block.text for block in response.content if block.type == "text")
+
+
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
+
+def add_usage(totals, response):
+    usage = getattr(response, "usage", None)
+    for field in USAGE_FIELDS:
+        totals[field] += getattr(usage, field, None) or 0
+
+
+def spent_tokens(totals):
+    return sum(totals.values())
+
+
+def ask(user_question: str, client=None, snapshot=None):
+    """
+    Answers a question about the team, letting Claude call the stats tools as
+    many times as it needs (up to AGENT_MAX_TURNS round trips).
+
+    Returns {'answer', 'cached', 'truncated', 'usage'}; usage totals the
+    tokens of every round trip, and truncated means the model ran out of
+    tokens mid-answer. Repeated (or near-identical) questions on the same
+    snapshot are answered from cache without calling the model; only
+    answers the model finished (stop_reason "end_turn") are cached. Each question may
+    spend at most AGENT_REQUEST_TOKEN_BUDGET tokens, and the process at most
+    AGENT_HOURLY_TOKEN_BUDGET per hour.
+
+    client is anything with an Anthropic-style messages.create (e.g. a fake in
+    tests); snapshot defaults to the shared store's current data.
+    """
+    snapshot = snapshot or get_store().get()
+    usage = dict.fromkeys(USAGE_FIELDS, 0)
+    if snapshot is None:
+        return {"answer": NO_DATA_ANSWER, "cached": False, "truncated": False, "usage": usage}
+    
+    cached = _answers.get(user_question, snapshot.version)
+    cache_result('answers', 'miss' if cached is None else 'hit')
+    if cached is not None:
+        return {"answer": cached, "cached": True, "truncated": False, "usage": usage}
+    
+    if _budget.remaining() <= 0:
+        return {"answer": "The assistant is over its usage budget right now, try again later.",
+                "cached": False, "truncated": False, "usage": usage}
+    
+    client = client or get_client()
+    messages = [{"role": "user", "content": user_question}]
+    answer = None
+    stop_reason = None
+    
+    for _ in range(config.AGENT_MAX_TURNS):
+        remaining = config.AGENT_REQUEST_TOKEN_BUDGET - spent_tokens(usage)
+        if remaining <= 0:
+            break
+        
+        # Send to Claude
+        response = client.messages.create(
+            model=config.AGENT_MODEL,
+            max_tokens=min(config.AGENT_MAX_TOKENS, remaining),
+            system=CACHED_SYSTEM,
+            tools=CACHED_TOOLS,
+            messages=messages
+        )
+        add_usage(usage, response)
+        
+        tool_uses = [block for block in response.content if block.type == "tool_use"]
+        if response.stop_reason != "tool_use" or not tool_uses:
+            # Return final answer
+            answer = response_text(response)
+            stop_reason = response.stop_reason
+            break
+        
+        # Handle tool calls (Claude asking for data)
+        messages.append({"role": "assistant", "content": response.content})
+        messages.append({"role": "user", "content": run_tools(snapshot, tool_uses)})
+    
+    _budget.spend(spent_tokens(usage))
+    if answer is None:
+        return {"answer": "Sorry, I couldn't work that out from the stats.", "cached": False, "truncated": False, "usage": usage}
+    
+    if stop_reason == "end_turn":
+        _answers.put(user_question, snapshot.version, answer)
+    return {"answer": answer, "cached": False, "truncated": stop_reason == "max_tokens", "usage": usage}
+
+
+def chat_with_data(user_question: str, client=None, snapshot=None):
+    """
+    Answers a question about the team and returns just the text, see ask()
+    """
+    return ask(user_question, client=client, snapshot=snapshot)["answer"]
+
+
+async def stream_chat(user_question: str, client=None, snapshot=None):
+    """
+    Streaming version of ask(): an async generator of events
+        {'type': 'text', 'text': <delta>}
+        {'type': 'tool_call', 'name': <tool>, 'input': <args>}
+        {'type': 'tool_result', 'name': <tool>, 'is_error': <bool>}
+        {'type': 'done', 'answer': <final text>, 'cached': <bool>, 'truncated': <bool>, 'usage': <token totals>}
+    Text the model writes before a tool call ("Let me check.") is streamed
+    too, but like ask() the answer (and what gets cached) is the last turn's
+    text only. Caching and token budgets work as in ask().
+
+    client is anything with an AsyncAnthropic-style messages.stream(...): an
+    async context manager that yields events (type 'text' with .text,
+    'content_block_start' with .content_block) and has get_final_message().
+    """
+    snapshot = snapshot or await asyncio.to_thread(get_store().get)
+    usage = dict.fromkeys(USAGE_FIELDS, 0)
+    if snapshot is None:
+        yield {"type": "text", "text": NO_DATA_ANSWER}
+        yield {"type": "done", "answer": NO_DATA_ANSWER, "cached": False, "truncated": False, "usage": usage}
+        return
+    
+    cached = _answers.get(user_question, snapshot.version)
+    cache_result('answers', 'miss' if cached is None else 'hit')
+    if cached is not None:
+        yield {"type": "text", "text": cached}
+        yield {"type": "done", "answer": cached, "cached": True, "truncated": False, "usage": usage}
+        return
+    
+    if _budget.remaining() <= 0:
+        answer = "The assistant is over its usage budget right now, try again later."
+        yield {"type": "text", "text": answer}
+        yield {"type": "done", "answer": answer, "cached": False, "truncated": False, "usage": usage}
+        return
+    
+    client = client or get_async_client()
+    messages = [{"role": "user", "content": user_question}]
+    stop_reason = None
+    
+    for _ in range(config.AGENT_MAX_TURNS):
+        remaining = config.AGENT_REQUEST_TOKEN_BUDGET - spent_tokens(usage)
+        if remaining <= 0:
+            break
+        
+        async with client.messages.stream(
+            model=config.AGENT_MODEL,
+            max_tokens=min(config.AGENT_MAX_TOKENS, remaining),
+            system=CACHED_SYSTEM,
+            tools=CACHED_TOOLS,
+            messages=messages
+        ) as stream:
+            parts = []
+            async for event in stream:
+                if event.type == "text":
+                    parts.append(event.text)
+                    yield {"type": "text", "text": event.text}
+            response = await stream.get_final_message()
+        add_usage(usage, response)
+        
+        tool_uses = [block for block in response.content if block.type == "tool_use"]
+        if response.stop_reason != "tool_use" or not tool_uses:
+            stop_reason = response.stop_reason
+            break
+        
+        for block in tool_uses:
+            yield {"type": "tool_call", "name": block.name, "input": block.input}
+        results = await asyncio.to_thread(run_tools, snapshot, tool_uses)
+        for block, result in zip(tool_uses, results):
+            yield {"type": "tool_result", "name": block.name, "is_error": result["is_error"]}
+        
+        messages.append({"role": "assistant", "content": response.content})
+        messages.append({"role": "user", "content": results})
+    
+    _budget.spend(spent_tokens(usage))
+    if stop_reason is None:
+        answer = "Sorry, I couldn't work that out from the stats."
+        yield {"type": "text", "text": answer}
+    else:
+        answer = "".join(parts)
+    if stop_reason == "end_turn":
+        _answers.put(user_question, snapshot.version, answer)
+    yield {"type": "done", "answer": answer, "cached": False, "truncated": stop_reason == "max_tokens", "usage": usage}
+
+
+def stream_chat_sync(user_question: str, client=None, snapshot=None):
+    """
+    stream_chat() for synchronous callers such as Streamlit: a plain
+    generator driving the async one on a private event loop
+    """
+    loop = asyncio.new_event_loop()
+    # The shared async client's connections belong to another event loop
+    events = stream_chat(user_question, client=client or AsyncAnthropic(), snapshot=snapshot)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(events.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(events.aclose())
+        loop.close()
@@ -0,0 +1,116 @@
+"""
+Answer cache and token budget for the analytics agent.
+
+Answers are keyed by (normalised question, snapshot version): an exact
+match on the normalised text is a dict lookup, and a question with the
+same content words (stopwords dropped, plurals and contractions folded)
+reuses the answer too, so "Who's our top scorer?" and "who is the top
+scorer" share one answer. Any extra content word is a different question:
+"last season" or "in October" never gets this season's answer. A new
+snapshot starts an empty cache.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+import config
+
+_CONTRACTIONS = {"who's": "who is", "what's": "what is", "how's": "how is", "we've": "we have",
+                 "didn't": "did not", "isn't": "is not", "hasn't": "has not"}
+_STOPWORDS = {"a", "an", "the", "is", "are", "was", "were", "our", "we", "us", "of", "for", "to",
+              "in", "on", "me", "please", "tell", "show", "what", "who", "how", "does", "do",
+              "did", "has", "have", "team", "edison", "this", "season", "so", "far"}
+
+
+def normalize_question(question):
+    text = question.lower().replace("’", "'")
+    for short, full in _CONTRACTIONS.items():
+        text = text.replace(short, full)
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+def content_words(normalized):
+    # Crude plural folding so "scorers" and "scorer" match; numbers always count
+    return frozenset(
+        word[:-1] if len(word) > 3 and word.endswith("s") and not word.isdigit() else word
+        for word in normalized.split()
+        if word not in _STOPWORDS
+    )
+
+
+class AnswerCache:
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or config.AGENT_ANSWER_CACHE_SIZE
+        self._version = None
+        self._answers = OrderedDict()
+        # content words -> normalised question last cached with them
+        self._by_words = {}
+        self._lock = threading.Lock()
+
+    def _sync(self, version):
+        if version != self._version:
+            self._answers = OrderedDict()
+            self._by_words = {}
+            self._version = version
+
+    def get(self, question, version):
+        """
+        Returns a cached answer for question, or None
+        """
+        normalized = normalize_question(question)
+        with self._lock:
+            self._sync(version)
+            if normalized in self._answers:
+                self._answers.move_to_end(normalized)
+                return self._answers[normalized][1]
+            
+            key = self._by_words.get(content_words(normalized))
+            if key is None:
+                return None
+            self._answers.move_to_end(key)
+            return self._answers[key][1]
+
+    def put(self, question, version, answer):
+        normalized = normalize_question(question)
+        with self._lock:
+            self._sync(version)
+            words = content_words(normalized)
+            self._answers[normalized] = (words, answer)
+            self._answers.move_to_end(normalized)
+            if words:
+                self._by_words[words] = normalized
+            while len(self._answers) > self.max_entries:
+                _, (old_words, _) = self._answers.popitem(last=False)
+                if self._by_words.get(old_words) not in self._answers:
+                    self._by_words.pop(old_words, None)
+
+
+class TokenBudget:
+    """
+    Sliding one-hour window of tokens spent by the whole process
+    """
+
+    def __init__(self, tokens_per_hour=None):
+        self.tokens_per_hour = config.AGENT_HOURLY_TOKEN_BUDGET if tokens_per_hour is None else tokens_per_hour
+        self._spent = deque()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        while self._spent and now - self._spent[0][0] > 3600:
+            self._total -= self._spent.popleft()[1]
+
+    def remaining(self):
+        if not self.tokens_per_hour:
+            return float("inf")
+        with self._lock:
+            self._expire(time.time())
+            return max(0, self.tokens_per_hour - self._total)
+
+    def spend(self, tokens):
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            self._spent.append((now, tokens))
+            self._total += tokens
@@ -1,27 +1,184 @@
-from fastapi import FastAPI
-from scraper import scrape_all_data
-import pandas as pd
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+import config
+import export
+import instrumentation
+from ai_agent import stream_chat
+from api_cache import cached_json
+from data_store import get_store
+from indexes import get_index, peek_index
+from scheduler import start_scheduler
+import queries
 
 app = FastAPI()
+# Cached endpoints compress themselves once; this covers everything else
+app.add_middleware(GZipMiddleware, minimum_size=config.API_COMPRESS_MIN_BYTES)
+
+@app.middleware("http")
+async def time_handlers(request: Request, call_next):
+    # One 'handler' span per request, labelled with the route template rather
+    # than the raw path. Streamed responses are timed up to their headers.
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get('route')
+    instrumentation.observe('handler', time.perf_counter() - start,
+                            route=getattr(route, 'path', 'unmatched'), method=request.method)
+    return response
 
-# Load data once at startup
+# Serve the last saved snapshot straight away and scrape in the background.
+# Nothing here touches nj.com or the disk on the event loop.
 @app.on_event("startup")
 async def load_data():
-    global team_data
-    team_data = scrape_all_data()
+    store = get_store()
+    snapshot = await asyncio.to_thread(store.load_persisted)
+    if snapshot is not None:
+        await asyncio.to_thread(get_index, snapshot)
+    # Build the index for every new snapshot in the refresh thread, not in a request
+    store.subscribe(get_index)
+    start_scheduler()
+
+def served_snapshot(store):
+    # Latest snapshot, swapped in atomically by the scheduler. Missing or
+    # stale data is also refreshed from here, in a background thread, so the
+    # API keeps working without the scheduler (EDISON_SCHEDULER=0).
+    snapshot = store.snapshot
+    if snapshot is None or snapshot.age > store.ttl:
+        store.refresh_async()
+    return snapshot
+
+async def current_snapshot():
+    snapshot = served_snapshot(get_store())
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Data is still loading", headers={"Retry-After": "5"})
+    if peek_index(snapshot) is None:
+        await asyncio.to_thread(get_index, snapshot)
+    return snapshot
+
+@app.get("/api/ready")
+async def ready():
+    # Readiness probe: 200 once a snapshot is loaded, with how old it is
+    store = get_store()
+    snapshot = served_snapshot(store)
+    if snapshot is None or not snapshot.usable:
+        raise HTTPException(status_code=503, detail="Data is still loading", headers={"Retry-After": "5"})
+    return JSONResponse({
+        'ready': True,
+        'snapshot_version': snapshot.version,
+        'snapshot_age_seconds': round(snapshot.age, 1),
+        'refreshing': store.refreshing,
+    }, headers={'Cache-Control': 'no-store'})
+
+@app.get("/metrics")
+async def metrics():
+    # Timings, cache hit/miss counts and snapshot age for Prometheus to scrape
+    return PlainTextResponse(instrumentation.render_prometheus(), media_type='text/plain; version=0.0.4',
+                             headers={'Cache-Control': 'no-store'})
 
 # Functions Claude can call
+# Responses are served from pre-serialised bytes per snapshot, see api_cache
 @app.get("/api/player/{name}")
-def get_player_stats(name: str):
+async def get_player_stats(name: str, request: Request):
     # Return stats for specific player
-    pass
+    snapshot = await current_snapshot()
+    
+    def build():
+        try:
+            player = queries.player_stats(snapshot, name)
+        except queries.AmbiguousName as e:
+            raise HTTPException(status_code=409, detail={'message': str(e), 'choices': e.choices})
+        if player is None:
+            raise HTTPException(status_code=404, detail=f"No player matching '{name}'")
+        return player
+    
+    return cached_json(request, snapshot, build)
 
 @app.get("/api/team/top_scorers")
-def get_top_scorers(limit: int = 5):
+async def get_top_scorers(request: Request, limit: int = Query(5, ge=1, le=100)):
     # Return top goal scorers
-    pass
+    snapshot = await current_snapshot()
+    return cached_json(request, snapshot, lambda: queries.top_scorers(snapshot, limit))
+
+@app.get("/api/team/summary")
+async def get_team_summary(request: Request):
+    # Season totals, record, leaders and change since last season
+    snapshot = await current_snapshot()
+    return cached_json(request, snapshot, lambda: queries.team_summary(snapshot))
 
 @app.get("/api/opponent/{team_name}")
-def get_opponent_info(team_name: str):
+async def get_opponent_info(team_name: str, request: Request):
     # Find games vs this team, get their record
-    pass
+    snapshot = await current_snapshot()
+    
+    def build():
+        try:
+            info = queries.opponent_info(snapshot, team_name)
+        except queries.AmbiguousName as e:
+            raise HTTPException(status_code=409, detail={'message': str(e), 'choices': e.choices})
+        if info is None:
+            raise HTTPException(status_code=404, detail=f"No games against '{team_name}'")
+        return info
+    
+    return cached_json(request, snapshot, build)
+
+class BatchRequest(BaseModel):
+    players: list[str] = Field(default_factory=list, max_length=100)
+    opponents: list[str] = Field(default_factory=list, max_length=100)
+    top_scorers: int | None = Field(default=None, ge=1, le=100)
+
+def lookup_or_none(query, snapshot, name):
+    try:
+        return query(snapshot, name)
+    except queries.AmbiguousName:
+        return None
+
+@app.post("/api/batch")
+async def batch_lookup(batch: BatchRequest):
+    # Many player/opponent lookups in one round trip; misses and ambiguous names come back as null
+    snapshot = await current_snapshot()
+    result = {
+        'players': {name: lookup_or_none(queries.player_stats, snapshot, name) for name in batch.players},
+        'opponents': {name: lookup_or_none(queries.opponent_info, snapshot, name) for name in batch.opponents},
+    }
+    if batch.top_scorers:
+        result['top_scorers'] = queries.top_scorers(snapshot, batch.top_scorers)
+    return result
+
+@app.get("/api/export/{table}")
+async def export_table(table: str, format: str = Query("ndjson", pattern="^(ndjson|arrow)$")):
+    # Whole season table streamed straight from the snapshot
+    snapshot = await current_snapshot()
+    tables = export.export_tables(snapshot)
+    if table not in tables:
+        raise HTTPException(status_code=404, detail=f"Unknown table '{table}', expected one of {sorted(tables)}")
+    if format == 'arrow' and export.pa is None:
+        raise HTTPException(status_code=501, detail="Arrow export needs pyarrow installed")
+    
+    return StreamingResponse(
+        export.export_chunks(tables[table], format),
+        media_type=export.FORMATS[format],
+        headers={'Content-Disposition': f'attachment; filename="{table}.{format}"'},
+    )
+
+@app.get("/api/chat/stream")
+async def chat_stream(q: str = Query(..., min_length=1, max_length=1000)):
+    # Server-Sent Events: one event per text delta / tool call, then 'done'
+    snapshot = await current_snapshot()
+    
+    async def events():
+        try:
+            async for event in stream_chat(q, snapshot=snapshot):
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'type': 'error', 'detail': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
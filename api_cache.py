@@ -0,0 +1,123 @@
+"""
+Pre-serialised, pre-compressed API responses for the current snapshot.
+
+A response body is built and JSON-encoded once per (snapshot, URL). Its
+gzip/brotli variants are compressed on first request and reused, so a
+repeated request costs a dict lookup, and a conditional request with a
+matching ETag costs even less.
+"""
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+from fastapi import Response
+
+import config
+from instrumentation import cache_result
+from scheduler import refresh_cadence
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class CachedBody:
+    def __init__(self, body):
+        self.identity = body
+        # Weak because the same ETag is served for every content-encoding
+        self.etag = f'W/"{hashlib.sha1(body).hexdigest()[:20]}"'
+        self._encoded = {}
+
+    def encoded(self, encoding):
+        if encoding == 'identity':
+            return self.identity
+        if encoding not in self._encoded:
+            if encoding == 'br':
+                self._encoded[encoding] = brotli.compress(self.identity, quality=5)
+            else:
+                self._encoded[encoding] = gzip.compress(self.identity, compresslevel=6, mtime=0)
+        return self._encoded[encoding]
+
+
+class ResponseCache:
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or config.API_CACHE_MAX_ENTRIES
+        self._version = None
+        self._cadence = None
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _sync(self, snapshot):
+        # Everything cached belongs to one snapshot version
+        if snapshot.version != self._version:
+            with self._lock:
+                if snapshot.version != self._version:
+                    self._entries = {}
+                    self._cadence = refresh_cadence(snapshot)
+                    self._version = snapshot.version
+
+    def get(self, snapshot, key, build):
+        self._sync(snapshot)
+        entry = self._entries.get(key)
+        cache_result('api', 'miss' if entry is None else 'hit')
+        if entry is None:
+            payload = build()
+            entry = CachedBody(json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+            if len(self._entries) < self.max_entries:
+                self._entries[key] = entry
+        return entry
+
+    def max_age(self, snapshot):
+        # Until the next scheduled refresh is due
+        return max(0, int(snapshot.created_at + (self._cadence or 0) - time.time()))
+
+
+def etag_matches(if_none_match, etag):
+    # Weak comparison, as If-None-Match requires
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in tags or etag.removeprefix('W/') in tags
+
+
+def negotiate_encoding(accept_encoding, size):
+    if size < config.API_COMPRESS_MIN_BYTES or not accept_encoding:
+        return 'identity'
+    offered = {part.split(';')[0].strip().lower() for part in accept_encoding.split(',')}
+    if brotli is not None and 'br' in offered:
+        return 'br'
+    if 'gzip' in offered:
+        return 'gzip'
+    return 'identity'
+
+
+_cache = ResponseCache()
+
+
+def cached_json(request, snapshot, build):
+    """
+    Returns build()'s JSON for this URL and snapshot, with ETag/304 handling,
+    Cache-Control tied to the refresh cadence and content negotiation.
+    build() runs only on a cache miss; exceptions it raises (e.g. 404s) pass
+    through uncached.
+    """
+    key = (request.url.path, request.url.query)
+    entry = _cache.get(snapshot, key, build)
+    
+    max_age = _cache.max_age(snapshot)
+    headers = {
+        'ETag': entry.etag,
+        'Cache-Control': f'public, max-age={max_age}, stale-while-revalidate=60',
+        'Vary': 'Accept-Encoding',
+    }
+    
+    if etag_matches(request.headers.get('if-none-match'), entry.etag):
+        return Response(status_code=304, headers=headers)
+    
+    encoding = negotiate_encoding(request.headers.get('accept-encoding'), len(entry.identity))
+    if encoding != 'identity':
+        headers['Content-Encoding'] = encoding
+    return Response(content=entry.encoded(encoding), media_type='application/json', headers=headers)
@@ -1,7 +1,13 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-from scraper import scrape_all_data
+import config
+import instrumentation
+from ai_agent import stream_chat_sync
+from data_store import get_store
+from figures import get_figure
+from indexes import get_index
+from metrics import get_metrics
+from scheduler import start_scheduler
 
 # Page config
 st.set_page_config(
@@ -239,20 +245,40 @@ st.markdown("""
     <div class="subtitle">Advanced Analytics Dashboard • 2025-2026 Season</div>
 """, unsafe_allow_html=True)
 
-# Load all data
+# Load all data (shared across sessions, only scraped when stale)
+store = get_store()
+start_scheduler()
 with st.spinner("🔄 Loading data from nj.com..."):
-    data = scrape_all_data()
+    snapshot = store.get()
+
+if snapshot is None:
+    st.error("❌ Failed to load data. Please refresh the page in a minute.")
+    st.stop()
+
+refresh_col1, refresh_col2 = st.columns([5, 1])
+with refresh_col2:
+    if st.button("🔄 Refresh now", use_container_width=True):
+        with st.spinner("🔄 Refreshing data from nj.com..."):
+            snapshot = store.refresh()
+with refresh_col1:
+    st.caption(f"Data updated {int(snapshot.age // 60)} min ago")
+
+data = snapshot.data
 
 if not data or not data['current_stats']:
     st.error("❌ Failed to load data. Please refresh the page.")
     st.stop()
 
 # Extract data
+metrics = get_metrics(snapshot)
+season = snapshot.aggregates['current']
+change = snapshot.aggregates['change']
 current_field = data['current_stats']['field_players']
-current_goalies = data['current_stats']['goalies']
+current_goalies = metrics.goalies
 prev_field = data['previous_stats']['field_players'] if data['previous_stats'] else pd.DataFrame()
 prev_goalies = data['previous_stats']['goalies'] if data['previous_stats'] else pd.DataFrame()
-fixtures = data['fixtures']['games']
+# Copy, because the snapshot is shared with other sessions and gets modified below
+fixtures = data['fixtures']['games'].copy()
 roster = data['roster']
 coach = data['fixtures']['coach']
 
@@ -267,27 +293,26 @@ st.markdown("<br>", unsafe_allow_html=True)
 col1, col2, col3, col4, col5 = st.columns(5)
 
 with col1:
-    st.metric("Team Goals", f"{current_field['Goals'].sum()}", delta=f"+{current_field['Goals'].sum() - (prev_field['Goals'].sum() if not prev_field.empty else 0)}")
+    st.metric("Team Goals", f"{season['goals']}", delta=f"+{change['goals']}")
 
 with col2:
-    st.metric("Team Assists", f"{current_field['Assists'].sum()}", delta=f"+{current_field['Assists'].sum() - (prev_field['Assists'].sum() if not prev_field.empty else 0)}")
+    st.metric("Team Assists", f"{season['assists']}", delta=f"+{change['assists']}")
 
 with col3:
-    st.metric("Total Saves", f"{current_goalies['Saves'].sum()}")
+    st.metric("Total Saves", f"{season['saves']}")
 
 with col4:
-    wins = len(fixtures[fixtures['Outcome'] == 'W'])
-    losses = len(fixtures[fixtures['Outcome'] == 'L'])
-    st.metric("Record", f"{wins}-{losses}")
+    record = snapshot.aggregates['record']
+    st.metric("Record", f"{record['wins']}-{record['losses']}")
 
 with col5:
-    top_scorer = current_field.loc[current_field['Goals'].idxmax()]
-    st.metric("Top Scorer", top_scorer['Player'].split()[0], delta=f"{top_scorer['Goals']}G")
+    top_scorer = season['top_performers'][0]
+    st.metric("Top Scorer", top_scorer['player'].split()[0], delta=f"{top_scorer['goals']}G")
 
 st.markdown("<br>", unsafe_allow_html=True)
 
 # Tabs
-tabs = st.tabs(["⚽ Field Players", "🧤 Goalkeepers", "📅 Schedule", "👥 Roster", "📊 Year Comparison", "🎯 Team Analysis"])
+tabs = st.tabs(["⚽ Field Players", "🧤 Goalkeepers", "📅 Schedule", "👥 Roster", "📊 Year Comparison", "🎯 Team Analysis", "🤖 Ask the Data"])
 
 # TAB 1: Field Players
 with tabs[0]:
@@ -297,7 +322,7 @@ with tabs[0]:
     with sort_col2:
         sort_by = st.selectbox("Sort by", ["Goals", "Assists", "Points"], key="sort_field")
     
-    field_sorted = current_field.sort_values(sort_by, ascending=False)
+    field_sorted = current_field.sort_values(sort_by, ascending=False, kind='stable')
     
     st.dataframe(field_sorted, use_container_width=True, height=400, hide_index=True)
     
@@ -307,140 +332,35 @@ with tabs[0]:
     
     with chart_col1:
         st.markdown("#### Top 10 Scorers")
-        top_scorers = field_sorted.head(10)
-        
-        fig1 = go.Figure(data=[
-            go.Bar(
-                x=top_scorers['Goals'],
-                y=top_scorers['Player'],
-                orientation='h',
-                marker=dict(
-                    color=['#DC143C', '#E31C42', '#EA2348', '#F12A4E', '#F73154', 
-                           '#FE385A', '#FF5270', '#FF6C86', '#FF869C', '#FFD700'][:len(top_scorers)],
-                    line=dict(color='white', width=2)
-                ),
-                text=top_scorers['Goals'],
-                textposition='outside',
-                textfont=dict(size=14, color='#1a1a1a', family='Inter')
-            )
-        ])
-        
-        fig1.update_layout(
-            height=400,
-            margin=dict(l=20, r=20, t=20, b=20),
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            xaxis=dict(showgrid=True, gridcolor='#f1f5f9', title='Goals'),
-            yaxis=dict(autorange="reversed"),
-            font=dict(color='#1a1a1a')
-        )
-        
-        st.plotly_chart(fig1, use_container_width=True)
+        st.plotly_chart(get_figure('top_scorers', snapshot, sort_by), use_container_width=True)
     
     with chart_col2:
         st.markdown("#### Goals vs Assists")
         
-        fig2 = go.Figure(data=[
-            go.Scatter(
-                x=current_field['Assists'],
-                y=current_field['Goals'],
-                mode='markers',
-                marker=dict(
-                    size=current_field['Points']*3 + 8,
-                    color=current_field['Points'],
-                    colorscale=[[0, '#FFD700'], [0.5, '#DC143C'], [1, '#8B0000']],
-                    showscale=True,
-                    colorbar=dict(title="Points"),
-                    line=dict(width=2, color='white')
-                ),
-                text=current_field['Player'],
-                hovertemplate='<b>%{text}</b><br>Goals: %{y}<br>Assists: %{x}<extra></extra>'
-            )
-        ])
-        
-        fig2.update_layout(
-            height=400,
-            margin=dict(l=20, r=20, t=20, b=20),
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            xaxis=dict(showgrid=True, gridcolor='#f1f5f9', title='Assists'),
-            yaxis=dict(showgrid=True, gridcolor='#f1f5f9', title='Goals'),
-            font=dict(color='#1a1a1a')
-        )
-        
-        st.plotly_chart(fig2, use_container_width=True)
+        st.plotly_chart(get_figure('goals_vs_assists', snapshot), use_container_width=True)
 
 # TAB 2: Goalkeepers
 with tabs[1]:
     st.markdown("### Goalkeeper Statistics")
     
-    current_goalies['Saves Per Game'] = current_goalies.apply(
-        lambda x: round(x['Saves'] / x['Games Played'], 2) if x['Games Played'] > 0 else 0, axis=1
-    )
-    
-    st.dataframe(current_goalies, use_container_width=True, height=300, hide_index=True)
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    chart_col1, chart_col2 = st.columns(2)
-    
-    with chart_col1:
-        st.markdown("#### Total Saves")
-        
-        fig3 = go.Figure(data=[
-            go.Bar(
-                x=current_goalies['Player'],
-                y=current_goalies['Saves'],
-                marker=dict(
-                    color=['#DC143C', '#E92952', '#FFD700', '#F73F68'][:len(current_goalies)],
-                    line=dict(color='white', width=2)
-                ),
-                text=current_goalies['Saves'],
-                textposition='outside',
-                textfont=dict(color='#1a1a1a')
-            )
-        ])
+    if not current_goalies.empty:
+        st.dataframe(current_goalies, use_container_width=True, height=300, hide_index=True)
         
-        fig3.update_layout(
-            height=350,
-            margin=dict(l=20, r=20, t=20, b=20),
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            xaxis=dict(tickangle=-45),
-            yaxis=dict(showgrid=True, gridcolor='#f1f5f9'),
-            font=dict(color='#1a1a1a')
-        )
-        
-        st.plotly_chart(fig3, use_container_width=True)
-    
-    with chart_col2:
-        st.markdown("#### Saves Per Game Average")
+        st.markdown("<br>", unsafe_allow_html=True)
         
-        fig4 = go.Figure(data=[
-            go.Bar(
-                x=current_goalies['Player'],
-                y=current_goalies['Saves Per Game'],
-                marker=dict(
-                    color=['#FFD700', '#DC143C', '#E92952', '#F73F68'][:len(current_goalies)],
-                    line=dict(color='white', width=2)
-                ),
-                text=current_goalies['Saves Per Game'],
-                textposition='outside',
-                textfont=dict(color='#1a1a1a')
-            )
-        ])
+        chart_col1, chart_col2 = st.columns(2)
         
-        fig4.update_layout(
-            height=350,
-            margin=dict(l=20, r=20, t=20, b=20),
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            xaxis=dict(tickangle=-45),
-            yaxis=dict(showgrid=True, gridcolor='#f1f5f9'),
-            font=dict(color='#1a1a1a')
-        )
+        with chart_col1:
+            st.markdown("#### Total Saves")
+            
+            st.plotly_chart(get_figure('goalie_saves', snapshot), use_container_width=True)
         
-        st.plotly_chart(fig4, use_container_width=True)
+        with chart_col2:
+            st.markdown("#### Saves Per Game Average")
+            
+            st.plotly_chart(get_figure('goalie_saves_per_game', snapshot), use_container_width=True)
+    else:
+        st.info("No goalkeeper data available")
 
 # TAB 3: Schedule
 with tabs[2]:
@@ -452,33 +372,13 @@ with tabs[2]:
         fixtures['Result'] = fixtures['Result'].str.replace('\n', ' ').str.strip()
         
         # Display full schedule
-        st.dataframe(fixtures, use_container_width=True, height=500, hide_index=True)
+        st.dataframe(fixtures, use_container_width=True, height=500, hide_index=True,
+                     column_config={'Date': st.column_config.DateColumn(format="ddd, MMM D")})
         
         st.markdown("<br>", unsafe_allow_html=True)
         
         # Win/Loss visualization
-        outcome_counts = fixtures['Outcome'].value_counts()
-        
-        fig_schedule = go.Figure(data=[
-            go.Pie(
-                labels=outcome_counts.index,
-                values=outcome_counts.values,
-                hole=0.4,
-                marker=dict(colors=['#DC143C', '#8B0000', '#FFD700']),
-                textfont=dict(size=16, color='white', family='Inter')
-            )
-        ])
-        
-        fig_schedule.update_layout(
-            height=400,
-            margin=dict(l=20, r=20, t=40, b=20),
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            title=dict(text="Season Record", font=dict(size=20, color='#1a1a1a')),
-            font=dict(color='#1a1a1a')
-        )
-        
-        st.plotly_chart(fig_schedule, use_container_width=True)
+        st.plotly_chart(get_figure('season_record', snapshot), use_container_width=True)
     else:
         st.info("No schedule data available")
 
@@ -496,39 +396,7 @@ with tabs[3]:
         if 'Position' in roster.columns:
             st.markdown("#### Team Composition by Position")
             
-            # Count positions (some players have multiple)
-            position_counts = {}
-            for pos in roster['Position']:
-                positions = str(pos).split(',')
-                for p in positions:
-                    p = p.strip()
-                    if p in position_counts:
-                        position_counts[p] += 1
-                    else:
-                        position_counts[p] = 1
-            
-            fig_positions = go.Figure(data=[
-                go.Bar(
-                    x=list(position_counts.keys()),
-                    y=list(position_counts.values()),
-                    marker=dict(color='#DC143C', line=dict(color='white', width=2)),
-                    text=list(position_counts.values()),
-                    textposition='outside',
-                    textfont=dict(color='#1a1a1a')
-                )
-            ])
-            
-            fig_positions.update_layout(
-                height=350,
-                margin=dict(l=20, r=20, t=20, b=20),
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                xaxis=dict(title='Position'),
-                yaxis=dict(title='Players', showgrid=True, gridcolor='#f1f5f9'),
-                font=dict(color='#1a1a1a')
-            )
-            
-            st.plotly_chart(fig_positions, use_container_width=True)
+            st.plotly_chart(get_figure('positions', snapshot), use_container_width=True)
     else:
         st.info("No roster data available")
 
@@ -542,69 +410,18 @@ with tabs[4]:
         with chart_col1:
             st.markdown("#### Total Goals Comparison")
             
-            comparison_data = pd.DataFrame({
-                'Season': ['2024-2025', '2025-2026'],
-                'Goals': [prev_field['Goals'].sum(), current_field['Goals'].sum()]
-            })
-            
-            fig_goals_compare = go.Figure(data=[
-                go.Bar(
-                    x=comparison_data['Season'],
-                    y=comparison_data['Goals'],
-                    marker=dict(color=['#8B0000', '#DC143C'], line=dict(color='white', width=2)),
-                    text=comparison_data['Goals'],
-                    textposition='outside',
-                    textfont=dict(size=18, color='#1a1a1a')
-                )
-            ])
-            
-            fig_goals_compare.update_layout(
-                height=350,
-                margin=dict(l=20, r=20, t=20, b=20),
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                yaxis=dict(showgrid=True, gridcolor='#f1f5f9'),
-                font=dict(color='#1a1a1a')
-            )
-            
-            st.plotly_chart(fig_goals_compare, use_container_width=True)
+            st.plotly_chart(get_figure('goals_comparison', snapshot), use_container_width=True)
         
         with chart_col2:
             st.markdown("#### Total Assists Comparison")
             
-            comparison_assists = pd.DataFrame({
-                'Season': ['2024-2025', '2025-2026'],
-                'Assists': [prev_field['Assists'].sum(), current_field['Assists'].sum()]
-            })
-            
-            fig_assists_compare = go.Figure(data=[
-                go.Bar(
-                    x=comparison_assists['Season'],
-                    y=comparison_assists['Assists'],
-                    marker=dict(color=['#FFB700', '#FFD700'], line=dict(color='white', width=2)),
-                    text=comparison_assists['Assists'],
-                    textposition='outside',
-                    textfont=dict(size=18, color='#1a1a1a')
-                )
-            ])
-            
-            fig_assists_compare.update_layout(
-                height=350,
-                margin=dict(l=20, r=20, t=20, b=20),
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                yaxis=dict(showgrid=True, gridcolor='#f1f5f9'),
-                font=dict(color='#1a1a1a')
-            )
-            
-            st.plotly_chart(fig_assists_compare, use_container_width=True)
+            st.plotly_chart(get_figure('assists_comparison', snapshot), use_container_width=True)
         
         # Returning players comparison
         st.markdown("#### Returning Player Performance")
         
-        # Find players in both years
-        prev_players = set(prev_field['Player'].str.strip().str.lower())
-        returning = current_field[current_field['Player'].str.strip().str.lower().isin(prev_players)].copy()
+        # Find players in both years (names linked fuzzily once per snapshot)
+        returning = current_field[current_field['Player'].isin(get_index(snapshot).returning_players)].copy()
         
         if not returning.empty:
             st.markdown(f"**{len(returning)} returning players from last season**")
@@ -626,24 +443,24 @@ with tabs[5]:
     with insight_col1:
         st.markdown('<div class="accent-box">', unsafe_allow_html=True)
         st.markdown("**🌟 Top Performers**")
-        top_3 = current_field.nlargest(3, 'Goals')[['Player', 'Goals', 'Assists']]
-        for idx, row in top_3.iterrows():
-            st.markdown(f"• **{row['Player']}**: {row['Goals']}G, {row['Assists']}A")
+        for player in season['top_performers']:
+            st.markdown(f"• **{player['player']}**: {player['goals']}G, {player['assists']}A")
         
         st.markdown("<br>**🧤 Best Goalkeeper**", unsafe_allow_html=True)
-        best_gk = current_goalies.loc[current_goalies['Saves'].idxmax()]
-        st.markdown(f"• **{best_gk['Player']}**: {best_gk['Saves']} saves in {best_gk['Games Played']} games")
+        best_gk = season['best_goalkeeper']
+        if best_gk is not None:
+            st.markdown(f"• **{best_gk['player']}**: {best_gk['saves']} saves in {best_gk['games_played']} games")
+        else:
+            st.markdown("• No goalkeeper data available")
         st.markdown('</div>', unsafe_allow_html=True)
     
     with insight_col2:
         st.markdown('<div class="accent-box">', unsafe_allow_html=True)
         st.markdown("**👥 Team Composition**")
-        st.markdown(f"• Total Players: {len(current_field) + len(current_goalies)}")
-        st.markdown(f"• Field Players: {len(current_field)}")
-        st.markdown(f"• Goalkeepers: {len(current_goalies)}")
-        
-        scoring_players = len(current_field[current_field['Goals'] > 0])
-        st.markdown(f"• Players with Goals: {scoring_players} ({round(scoring_players/len(current_field)*100)}%)")
+        st.markdown(f"• Total Players: {season['players']}")
+        st.markdown(f"• Field Players: {season['field_players']}")
+        st.markdown(f"• Goalkeepers: {season['goalkeepers']}")
+        st.markdown(f"• Players with Goals: {season['scoring_players']} ({season['scoring_share']}%)")
         st.markdown('</div>', unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
@@ -653,48 +470,67 @@ with tabs[5]:
     with chart_col1:
         st.markdown("#### Points Distribution")
         
-        fig5 = go.Figure(data=[
-            go.Histogram(
-                x=current_field['Points'],
-                nbinsx=15,
-                marker=dict(color='#DC143C', line=dict(color='white', width=1))
-            )
-        ])
-        
-        fig5.update_layout(
-            height=300,
-            margin=dict(l=20, r=20, t=20, b=20),
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            xaxis=dict(title='Points', showgrid=True, gridcolor='#f1f5f9'),
-            yaxis=dict(title='Players', showgrid=True, gridcolor='#f1f5f9'),
-            font=dict(color='#1a1a1a')
-        )
-        
-        st.plotly_chart(fig5, use_container_width=True)
+        st.plotly_chart(get_figure('points_histogram', snapshot), use_container_width=True)
     
     with chart_col2:
         st.markdown("#### Goals Distribution")
         
-        fig6 = go.Figure(data=[
-            go.Histogram(
-                x=current_field['Goals'],
-                nbinsx=12,
-                marker=dict(color='#FFD700', line=dict(color='white', width=1))
-            )
-        ])
-        
-        fig6.update_layout(
-            height=300,
-            margin=dict(l=20, r=20, t=20, b=20),
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            xaxis=dict(title='Goals', showgrid=True, gridcolor='#f1f5f9'),
-            yaxis=dict(title='Players', showgrid=True, gridcolor='#f1f5f9'),
-            font=dict(color='#1a1a1a')
-        )
-        
-        st.plotly_chart(fig6, use_container_width=True)
+        st.plotly_chart(get_figure('goals_histogram', snapshot), use_container_width=True)
+
+# TAB 7: Ask the Data
+with tabs[6]:
+    st.markdown("### Ask the Data")
+    
+    if 'chat_history' not in st.session_state:
+        st.session_state['chat_history'] = []
+    
+    for past_question, past_answer in st.session_state['chat_history']:
+        with st.chat_message("user"):
+            st.markdown(past_question)
+        with st.chat_message("assistant"):
+            st.markdown(past_answer)
+    
+    ask_col1, ask_col2 = st.columns([5, 1])
+    with ask_col1:
+        question = st.text_input("Ask a question about the team", key="chat_question", placeholder="Who's our top scorer?")
+    with ask_col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        ask = st.button("Ask", key="chat_ask", use_container_width=True)
+    
+    if ask and question:
+        with st.chat_message("user"):
+            st.markdown(question)
+        with st.chat_message("assistant"):
+            progress = st.empty()
+            
+            def answer_deltas():
+                # Text is rendered as it arrives; tool calls show up as a status line
+                for event in stream_chat_sync(question, snapshot=snapshot):
+                    if event['type'] == 'text':
+                        yield event['text']
+                    elif event['type'] == 'tool_call':
+                        progress.caption(f"🔎 Looking up {event['name'].replace('_', ' ')}...")
+                    elif event['type'] == 'done':
+                        progress.empty()
+                        if event.get('truncated'):
+                            progress.caption("✂️ The answer was cut short by the token limit")
+            
+            try:
+                answer = st.write_stream(answer_deltas())
+                st.session_state['chat_history'].append((question, answer))
+            except Exception as e:
+                st.error(f"❌ The assistant is unavailable: {e}")
+
+# Debug panel with this process's timings and cache counts (EDISON_DEBUG_PANEL=1 or ?debug=1)
+if config.DEBUG_PANEL or st.query_params.get("debug") == "1":
+    recorded = instrumentation.summary()
+    with st.expander("🛠️ Debug metrics"):
+        st.caption(f"Snapshot v{snapshot.version} • {snapshot.age:.0f}s old • metrics since process start")
+        if recorded['spans']:
+            st.dataframe(pd.DataFrame(recorded['spans']).round(2), use_container_width=True, hide_index=True)
+        caches = pd.DataFrame.from_dict(recorded['caches'], orient='index').fillna(0).astype(int)
+        if not caches.empty:
+            st.dataframe(caches, use_container_width=True)
 
 # Footer
 st.markdown("""
@@ -0,0 +1,102 @@
+"""
+Latency of the api.py handlers against a frozen fixture snapshot.
+
+Measures the handler coroutines directly (the code we own), both for full
+gzip responses and for 304 revalidations, and then the full HTTP stack through FastAPI's TestClient with concurrent clients. Run from
+the repo root:
+
+    python benchmarks/bench_api.py [--requests 5000] [--clients 8]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixture_data import install_frozen_store  # noqa: E402
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return statistics.median(samples), pick(0.95), pick(0.99)
+
+
+def make_request(path, headers=None):
+    from starlette.requests import Request
+    
+    path, _, query = path.partition("?")
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': query.encode(),
+        'headers': [(k.encode(), v.encode()) for k, v in (headers or {}).items()],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=8)
+    args = parser.parse_args()
+    
+    store = install_frozen_store()
+    import api
+    from fastapi.testclient import TestClient
+    
+    snapshot = store.snapshot
+    player = snapshot.data['current_stats']['field_players']['Player'].iloc[0]
+    opponent = snapshot.data['fixtures']['games']['Opponent'].iloc[0]
+    
+    loop = asyncio.new_event_loop()
+    calls = {
+        'player': (lambda request: api.get_player_stats(player, request), f"/api/player/{player}"),
+        'top_scorers': (lambda request: api.get_top_scorers(request, limit=5), "/api/team/top_scorers?limit=5"),
+        'opponent': (lambda request: api.get_opponent_info(opponent, request), f"/api/opponent/{opponent}"),
+    }
+    
+    # First call builds the index for the snapshot
+    start = time.perf_counter()
+    loop.run_until_complete(calls['top_scorers'][0](make_request("/api/team/top_scorers?limit=5")))
+    print(f"index build: {(time.perf_counter() - start) * 1000:.2f} ms\n")
+    
+    print(f"{'handler':<24}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}")
+    for name, (handler, path) in calls.items():
+        response = loop.run_until_complete(handler(make_request(path)))
+        variants = {
+            'gzip': make_request(path, {'accept-encoding': 'gzip'}),
+            '304': make_request(path, {'if-none-match': response.headers['etag']}),
+        }
+        for variant, request in variants.items():
+            samples = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                loop.run_until_complete(handler(request))
+                samples.append(time.perf_counter() - start)
+            p50, p95, p99 = percentiles(samples)
+            print(f"{name + ' (' + variant + ')':<24}{p50 * 1e6:>10.1f}{p95 * 1e6:>10.1f}{p99 * 1e6:>10.1f}")
+    
+    print(f"\n{'HTTP':<14}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}   ({args.clients} clients)")
+    with TestClient(api.app) as client:
+        for name, (_, path) in calls.items():
+            def timed(_):
+                start = time.perf_counter()
+                response = client.get(path)
+                assert response.status_code == 200, response.text
+                return time.perf_counter() - start
+            
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.clients) as pool:
+                samples = list(pool.map(timed, range(args.requests // 5)))
+            elapsed = time.perf_counter() - start
+            p50, _, p99 = percentiles(samples)
+            print(f"{name:<14}{p50 * 1e3:>10.2f}{p99 * 1e3:>10.2f}{len(samples) / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Streamlit rerun time of app.py against the frozen fixture snapshot, per tab, phase and interaction.
+
+Runs the dashboard headless through Streamlit's AppTest with the fixture
+store installed (no network, no scheduler) and times these scenarios:
+
+    cold             new session, figure/metric/index caches emptied
+    warm             rerun of the same session with nothing changed
+    sort_field new   "Sort by" changed to a key with no cached figure yet
+    sort_field       "Sort by" changed between keys already seen
+    refresh          "Refresh now" clicked (reloads and reparses the fixtures)
+
+Each rerun is split by tab (time inside each `with tabs[i]:` block) and by
+phase: snapshot load/refresh, metrics, figure build, Plotly chart
+serialisation and dataframe serialisation. The report is printed and, with
+--output, written as JSON along with the git revision and library versions,
+so runs can be compared across versions with --compare. Run from the repo root:
+
+    python benchmarks/bench_dashboard.py [--runs 5] [--output report.json] [--compare old.json]
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from collections import defaultdict
+from functools import wraps
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCHMARKS)
+
+from fixture_data import install_frozen_store  # noqa: E402
+
+APP = os.path.join(ROOT, "app.py")
+
+
+class Recorder:
+    """
+    Accumulates seconds per tab and per phase for the rerun in progress
+    """
+
+    def __init__(self):
+        self.tabs = defaultdict(float)
+        self.phases = defaultdict(float)
+
+    def reset(self):
+        self.tabs.clear()
+        self.phases.clear()
+
+    def timed(self, phase, fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.phases[phase] += time.perf_counter() - start
+        return wrapper
+
+
+class TimedTab:
+    """
+    Stands in for a tab container and times the code run inside `with tab:`
+    """
+
+    def __init__(self, tab, label, recorder):
+        self._tab = tab
+        self._label = label
+        self._recorder = recorder
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self._tab.__enter__()
+
+    def __exit__(self, *exc):
+        try:
+            return self._tab.__exit__(*exc)
+        finally:
+            self._recorder.tabs[self._label] += time.perf_counter() - self._start
+
+    def __getattr__(self, name):
+        return getattr(self._tab, name)
+
+
+def instrument(recorder):
+    """
+    Wraps the functions the dashboard spends its time in. AppTest runs the
+    script in this process, so patching the shared modules is enough.
+    """
+    import streamlit as st
+    import data_store
+    import figures
+    import metrics
+
+    data_store.DataStore.get = recorder.timed("snapshot", data_store.DataStore.get)
+    data_store.DataStore.refresh = recorder.timed("snapshot", data_store.DataStore.refresh)
+    metrics.build_metrics = recorder.timed("metrics", metrics.build_metrics)
+    for kind, build in list(figures.FIGURES.items()):
+        figures.FIGURES[kind] = recorder.timed("figure build", build)
+    st.plotly_chart = recorder.timed("plotly serialise", st.plotly_chart)
+    st.dataframe = recorder.timed("dataframe serialise", st.dataframe)
+
+    tabs = st.tabs
+
+    def timed_tabs(labels, *args, **kwargs):
+        return [TimedTab(tab, label, recorder) for tab, label in zip(tabs(labels, *args, **kwargs), labels)]
+    st.tabs = timed_tabs
+
+
+def clear_caches():
+    """
+    Drops everything memoised per snapshot, as in a freshly started server
+    """
+    import streamlit as st
+    import figures
+    import indexes
+    import metrics
+
+    figures._figures.clear()
+    metrics._metrics = None
+    indexes._index = None
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def new_session():
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(APP, default_timeout=120)
+
+
+def rerun(at, recorder, action=None):
+    """
+    Applies action to the session, reruns it and returns the rerun's timings
+    """
+    if action is not None:
+        action(at)
+    gc.collect()
+    recorder.reset()
+    start = time.perf_counter()
+    at.run()
+    total = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"app.py raised: {at.exception[0].value}")
+    return {'total': total, 'tabs': dict(recorder.tabs), 'phases': dict(recorder.phases)}
+
+
+def set_sort(key):
+    return lambda at: at.selectbox(key="sort_field").set_value(key)
+
+
+def click_refresh(at):
+    next(button for button in at.button if "Refresh now" in button.label).click()
+
+
+def run_scenarios(recorder, runs):
+    samples = defaultdict(list)
+    for _ in range(runs):
+        clear_caches()
+        at = new_session()
+        samples['cold'].append(rerun(at, recorder))
+        samples['warm'].append(rerun(at, recorder))
+        # The cold run only built the default "Goals" figure
+        samples['sort_field new'].append(rerun(at, recorder, set_sort("Assists")))
+        samples['sort_field'].append(rerun(at, recorder, set_sort("Goals")))
+        samples['refresh'].append(rerun(at, recorder, click_refresh))
+    return samples
+
+
+def median_of(samples, pick):
+    values = [pick(sample) for sample in samples]
+    return statistics.median(values) if values else 0.0
+
+
+def summarise(samples):
+    """
+    Median total, tab and phase times in ms per scenario
+    """
+    report = {}
+    for scenario, runs in samples.items():
+        totals = sorted(run['total'] for run in runs)
+        # dicts rather than sets keep the tabs in the order the app shows them
+        tabs = {label: None for run in runs for label in run['tabs']}
+        phases = {phase: None for run in runs for phase in sorted(run['phases'])}
+        report[scenario] = {
+            'median_ms': round(statistics.median(totals) * 1000, 2),
+            'max_ms': round(totals[-1] * 1000, 2),
+            'tabs_ms': {label: round(median_of(runs, lambda r: r['tabs'].get(label, 0.0)) * 1000, 2)
+                        for label in tabs},
+            'phases_ms': {phase: round(median_of(runs, lambda r: r['phases'].get(phase, 0.0)) * 1000, 2)
+                          for phase in phases},
+        }
+    return report
+
+
+def environment(runs):
+    import pandas
+    import plotly
+    import streamlit
+
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        'revision': revision,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'streamlit': streamlit.__version__,
+        'pandas': pandas.__version__,
+        'plotly': plotly.__version__,
+        'runs': runs,
+    }
+
+
+def print_report(report, previous=None):
+    previous = (previous or {}).get('scenarios', {})
+    print(f"{'scenario':<18}{'median ms':>10}{'max ms':>9}{'vs prev':>9}")
+    for scenario, result in report.items():
+        before = previous.get(scenario, {}).get('median_ms')
+        change = f"{result['median_ms'] / before:>8.2f}x" if before else f"{'-':>9}"
+        print(f"{scenario:<18}{result['median_ms']:>10.1f}{result['max_ms']:>9.1f}{change}")
+
+    for key, title in (('tabs_ms', 'tab'), ('phases_ms', 'phase')):
+        names = {name: None for result in report.values() for name in result[key]}
+        print(f"\n{title + ' ms':<24}" + "".join(f"{scenario:>16}" for scenario in report))
+        for name in names:
+            print(f"{name:<24}" + "".join(f"{result[key].get(name, 0.0):>16.1f}" for result in report.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    parser.add_argument("--compare", help="previous JSON report to compare medians with")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+
+    install_frozen_store()
+    recorder = Recorder()
+    instrument(recorder)
+
+    # One untimed session so imports and Streamlit's own start-up are not counted as cold
+    rerun(new_session(), recorder)
+
+    report = summarise(run_scenarios(recorder, args.runs))
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+    print_report(report, previous)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({'environment': environment(args.runs), 'scenarios': report}, f, indent=2)
+            f.write("\n")
+        print(f"\n💾 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
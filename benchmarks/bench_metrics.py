@@ -0,0 +1,124 @@
+"""
+Derived-metric time at multi-season, multi-school scale, row-wise vs vectorised.
+
+Builds synthetic tables shaped like the scraped ones (one block per school
+and season), runs the old row-wise code and metrics.py over them and checks
+both give the same answers. Run from the repo root:
+
+    python benchmarks/bench_metrics.py [--schools 50] [--seasons 10] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import outcome_counts, position_counts, saves_per_game, top_performers  # noqa: E402
+
+POSITIONS = ['GK', 'D', 'M', 'F', 'D, M', 'M, F', 'F, M']
+
+
+def synthetic_tables(schools, seasons, seed=0):
+    """
+    Field players, goalies, games and roster for schools x seasons teams
+    """
+    rng = np.random.default_rng(seed)
+    teams = schools * seasons
+    field_rows, goalie_rows, game_rows, roster_rows = teams * 25, teams * 3, teams * 18, teams * 30
+
+    goals = rng.poisson(3, field_rows)
+    assists = rng.poisson(2, field_rows)
+    field = pd.DataFrame({
+        'Player': [f"Player {i}" for i in range(field_rows)],
+        'Goals': goals,
+        'Assists': assists,
+        'Points': goals * 2 + assists,
+    })
+    goalies = pd.DataFrame({
+        'Player': [f"Keeper {i}" for i in range(goalie_rows)],
+        'Saves': rng.poisson(60, goalie_rows),
+        'Games Played': rng.integers(0, 18, goalie_rows),
+    })
+    games = pd.DataFrame({'Outcome': rng.choice(['W', 'L', 'T'], game_rows, p=[0.5, 0.4, 0.1])})
+    roster = pd.DataFrame({'Position': rng.choice(POSITIONS, roster_rows)})
+    return field, goalies, games, roster
+
+
+# The row-wise code app.py used before metrics.py, kept as the reference
+
+def rowwise_saves_per_game(goalies):
+    return goalies.apply(
+        lambda x: round(x['Saves'] / x['Games Played'], 2) if x['Games Played'] > 0 else 0, axis=1
+    )
+
+
+def rowwise_position_counts(positions):
+    position_counts = {}
+    for pos in positions:
+        for p in str(pos).split(','):
+            p = p.strip()
+            position_counts[p] = position_counts.get(p, 0) + 1
+    return position_counts
+
+
+def rowwise_record(games):
+    return len(games[games['Outcome'] == 'W']), len(games[games['Outcome'] == 'L'])
+
+
+def rowwise_top_performers(field, n=3):
+    top = field.nlargest(n, 'Goals')[['Player', 'Goals', 'Assists']]
+    return [{'Player': row['Player'], 'Goals': row['Goals'], 'Assists': row['Assists']} for _, row in top.iterrows()]
+
+
+def vectorised_record(games):
+    counts = outcome_counts(games['Outcome'])
+    return int(counts.get('W', 0)), int(counts.get('L', 0))
+
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--schools", type=int, default=50)
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    field, goalies, games, roster = synthetic_tables(args.schools, args.seasons)
+    print(f"{args.schools} schools x {args.seasons} seasons: {len(field)} field players, "
+          f"{len(goalies)} goalies, {len(games)} games, {len(roster)} roster rows\n")
+
+    cases = [
+        ("saves per game", lambda: rowwise_saves_per_game(goalies), lambda: saves_per_game(goalies),
+         lambda a, b: np.allclose(a.to_numpy(dtype=float), b.to_numpy())),
+        ("position counts", lambda: rowwise_position_counts(roster['Position']), lambda: position_counts(roster['Position']),
+         lambda a, b: a == b.to_dict()),
+        ("record", lambda: rowwise_record(games), lambda: vectorised_record(games),
+         lambda a, b: a == b),
+        ("top performers", lambda: rowwise_top_performers(field), lambda: top_performers(field),
+         lambda a, b: a == b),
+    ]
+
+    print(f"{'metric':<18}{'row-wise ms':>12}{'vectorised ms':>15}{'speedup':>9}")
+    for name, rowwise, vectorised, same in cases:
+        slow, expected = timed(rowwise, args.runs)
+        fast, result = timed(vectorised, args.runs)
+        print(f"{name:<18}{slow * 1000:>12.2f}{fast * 1000:>15.2f}{slow / fast:>8.1f}x")
+        if not same(expected, result):
+            print(f"  ⚠️ {name} differs from the row-wise result")
+
+
+if __name__ == "__main__":
+    main()
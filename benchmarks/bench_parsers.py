@@ -0,0 +1,74 @@
+"""
+Parse time and peak memory per page for each parser backend.
+
+Replays the recorded pages in benchmarks/fixtures through the scraper's
+parse functions. Run from the repo root:
+
+    python benchmarks/bench_parsers.py [--runs 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers import BACKENDS, HAS_LXML  # noqa: E402
+from scraper import parse_roster_page, parse_schedule_page, parse_stats_page  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+PAGES = [
+    ("stats_2025-2026.html", parse_stats_page),
+    ("stats_2024-2025.html", parse_stats_page),
+    ("schedule_2025-2026.html", parse_schedule_page),
+    ("roster_2025-2026.html", parse_roster_page),
+]
+
+
+def count_rows(parsed):
+    if isinstance(parsed, dict):
+        return sum(len(v) for v in parsed.values() if hasattr(v, "__len__") and not isinstance(v, str))
+    return len(parsed)
+
+
+def bench(parse, html, backend, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        parsed = parse(html, backend=backend)
+        times.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    parse(html, backend=backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return statistics.median(times), peak, count_rows(parsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    
+    backends = [name for name in BACKENDS if HAS_LXML or not name.startswith("lxml")]
+    baseline = "html.parser"
+    
+    print(f"{'page':<26}{'backend':<22}{'median ms':>10}{'peak KiB':>10}{'rows':>6}{'speedup':>9}")
+    for filename, parse in PAGES:
+        with open(os.path.join(FIXTURES, filename), encoding="utf-8") as f:
+            html = f.read()
+        
+        results = {backend: bench(parse, html, backend, args.runs) for backend in backends}
+        base_time = results[baseline][0]
+        for backend, (median, peak, rows) in results.items():
+            print(f"{filename:<26}{backend:<22}{median * 1000:>10.2f}{peak / 1024:>10.0f}{rows:>6}{base_time / median:>8.1f}x")
+            if rows != results[baseline][2]:
+                print(f"  ⚠️ {backend} parsed {rows} rows, {baseline} parsed {results[baseline][2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Scraper throughput against recorded pages, with baselines that fail the run on regressions.
+
+Serves the pages in benchmarks/fixtures from a local HTTP server at the
+URLs the scraper asks for (response cache and rate limit off), then times
+each stage per page: fetch (fetch_html), parse (the row generators) and
+DataFrame build (typed_frame), plus the whole scrape_* call, its rows/sec
+and peak memory.
+
+Results are compared with benchmarks/baselines/scraper.json. Speed is
+compared as the scrape's cost relative to an html.parser parse of the same
+page timed in the same run, so the baseline holds no machine-specific
+timings. Fewer rows than recorded (or none at all), or a cost more than
+--tolerance above the baseline, exits with status 1; --warn-on-slower only
+reports slowdowns, for noisy machines. Run from the repo root:
+
+    python benchmarks/bench_scraper.py [--runs 20] [--tolerance 0.3] [--warn-on-slower] [--update-baseline]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+import http_client  # noqa: E402
+import schema  # noqa: E402
+import scraper  # noqa: E402
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(BENCHMARKS, "fixtures")
+BASELINE = os.path.join(BENCHMARKS, "baselines", "scraper.json")
+# Pure-Python parser every machine has, timed as the yardstick for each page
+REFERENCE_BACKEND = "html.parser"
+
+# (fixture, season, season page, scraper function, row generator)
+PAGES = [
+    ("stats_2025-2026.html", "2025-2026", "stats", scraper.scrape_edison_soccer_stats, scraper.iter_stats_rows),
+    ("stats_2024-2025.html", "2024-2025", "stats", scraper.scrape_edison_soccer_stats, scraper.iter_stats_rows),
+    ("schedule_2025-2026.html", "2025-2026", "", scraper.scrape_fixtures,
+     partial(scraper.iter_schedule_rows, season="2025-2026")),
+    ("roster_2025-2026.html", "2025-2026", "roster", scraper.scrape_roster, scraper.iter_roster_rows),
+]
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """
+    Answers GETs for season page paths with the recorded page bytes
+    """
+    pages = {}
+
+    def do_GET(self):
+        body = self.pages.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures():
+    """
+    Starts the fixture server and points config.BASE_URL at it
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    config.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+    for filename, year, page, _, _ in PAGES:
+        with open(os.path.join(FIXTURES, filename), "rb") as f:
+            FixtureHandler.pages[urlsplit(scraper.season_url(year, page)).path] = f.read()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def count_rows(scraped):
+    """
+    Rows per table in a scrape_* result
+    """
+    if isinstance(scraped, dict):
+        return {table: len(df) for table, df in scraped.items() if hasattr(df, "columns")}
+    return {'roster': len(scraped)}
+
+
+def build_frames(rows):
+    tables = {}
+    for table, record in rows:
+        tables.setdefault(table, []).append(record)
+    return {table: schema.typed_frame(records, table) for table, records in tables.items()}
+
+
+def bench_page(year, page, scrape, iter_rows, runs):
+    url = scraper.season_url(year, page)
+    fetch, html = timed(lambda: scraper.fetch_html(url), runs)
+    parse, rows = timed(lambda: list(iter_rows(html)), runs)
+    build, _ = timed(lambda: build_frames(rows), runs)
+    reference, _ = timed(lambda: list(iter_rows(html, backend=REFERENCE_BACKEND)), runs)
+
+    # The scrape_* functions print their progress; keep the table readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        total, scraped = timed(lambda: scrape(year), runs)
+        tracemalloc.start()
+        scrape(year)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    counts = count_rows(scraped) if scraped is not None else {}
+    rows_total = sum(counts.values())
+    return {
+        'fetch_ms': round(fetch * 1000, 3),
+        'parse_ms': round(parse * 1000, 3),
+        'build_ms': round(build * 1000, 3),
+        'total_ms': round(total * 1000, 3),
+        'rows': counts,
+        'rows_per_sec': round(rows_total / total, 1) if total else 0.0,
+        'relative_cost': round(total / reference, 3) if reference else 0.0,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def baseline_entry(result):
+    """
+    The parts of a result that hold on any machine: row counts and relative cost
+    """
+    return {'rows': result['rows'], 'relative_cost': result['relative_cost']}
+
+
+def regressions(name, result, baseline, tolerance):
+    """
+    (missing rows, slowdowns) messages for result against its baseline entry
+    """
+    missing, slower = [], []
+    if not sum(result['rows'].values()):
+        missing.append(f"{name} parsed no rows")
+    if baseline is None:
+        return missing, slower
+    for table, expected in baseline['rows'].items():
+        got = result['rows'].get(table, 0)
+        if got < expected:
+            missing.append(f"{name} {table}: {got} rows, baseline {expected}")
+    ceiling = baseline['relative_cost'] * (1 + tolerance)
+    if result['relative_cost'] > ceiling:
+        slower.append(f"{name}: costs {result['relative_cost']:.2f}x a {REFERENCE_BACKEND} parse, "
+                      f"above {ceiling:.2f}x ({baseline['relative_cost']:.2f}x + {tolerance:.0%})")
+    return missing, slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help=f"allowed fractional rise in cost relative to {REFERENCE_BACKEND} before failing")
+    parser.add_argument("--warn-on-slower", action="store_true",
+                        help="report slowdowns without failing; only missing rows exit with status 1")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="record this run as the new baseline instead of checking it")
+    args = parser.parse_args()
+
+    # Every run has to hit the (local) server and parse, and nothing should throttle it
+    config.HTTP_CACHE_ENABLED = False
+    http_client._limiter = http_client.RateLimiter(0)
+    server = serve_fixtures()
+
+    baselines = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    results, missing, slower = {}, [], []
+    print(f"{'page':<26}{'fetch ms':>9}{'parse ms':>9}{'build ms':>9}{'total ms':>9}"
+          f"{'rows':>6}{'rows/s':>9}{'peak KiB':>10}{'cost':>8}{'vs base':>9}")
+    for filename, year, page, scrape, iter_rows in PAGES:
+        result = bench_page(year, page, scrape, iter_rows, args.runs)
+        results[filename] = result
+        baseline = baselines.get(filename)
+        change = f"{result['relative_cost'] / baseline['relative_cost']:>8.2f}x" if baseline else f"{'-':>9}"
+        print(f"{filename:<26}{result['fetch_ms']:>9.2f}{result['parse_ms']:>9.2f}{result['build_ms']:>9.2f}"
+              f"{result['total_ms']:>9.2f}{sum(result['rows'].values()):>6}{result['rows_per_sec']:>9.0f}"
+              f"{result['peak_kib']:>10.0f}{result['relative_cost']:>7.2f}x{change}")
+        page_missing, page_slower = regressions(filename, result, baseline, args.tolerance)
+        missing += page_missing
+        slower += page_slower
+    server.shutdown()
+    print(f"\ncost = scrape time / {REFERENCE_BACKEND} parse of the same page in this run")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({name: baseline_entry(result) for name, result in results.items()}, f, indent=2)
+            f.write("\n")
+        print(f"💾 Baseline written to {args.baseline}")
+    elif not baselines:
+        print(f"⚠️ No baseline at {args.baseline}; run with --update-baseline to record one")
+
+    for problem in missing + slower:
+        print(f"  ⚠️ {problem}")
+    if missing or (slower and not args.warn_on_slower):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
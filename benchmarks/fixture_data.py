@@ -0,0 +1,54 @@
+"""
+Frozen dataset built from the recorded pages in benchmarks/fixtures, so
+benchmarks never touch the network.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_store import DataStore, Snapshot  # noqa: E402
+from aggregates import build_aggregates  # noqa: E402
+from changes import fingerprints  # noqa: E402
+from scraper import parse_roster_page, parse_schedule_page, parse_stats_page  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def read_fixture(filename):
+    with open(os.path.join(FIXTURES, filename), encoding="utf-8") as f:
+        return f.read()
+
+
+def load_dataset():
+    """
+    Same structure scrape_all_data returns, parsed from the fixtures
+    """
+    return {
+        'current_stats': parse_stats_page(read_fixture("stats_2025-2026.html")),
+        'previous_stats': parse_stats_page(read_fixture("stats_2024-2025.html")),
+        'fixtures': parse_schedule_page(read_fixture("schedule_2025-2026.html")),
+        'roster': parse_roster_page(read_fixture("roster_2025-2026.html")),
+    }
+
+
+def frozen_snapshot(version=1):
+    data = load_dataset()
+    return Snapshot(data=data, version=version, created_at=time.time(), fingerprints=fingerprints(data),
+                    aggregates=build_aggregates(data))
+
+
+def install_frozen_store():
+    """
+    Replaces the process-wide DataStore with one that always serves the
+    fixture snapshot and never refreshes
+    """
+    import config
+    import data_store
+    
+    config.SCHEDULER_ENABLED = False
+    store = DataStore(loader=lambda **kwargs: load_dataset(), ttl=float("inf"))
+    store._snapshot = frozen_snapshot()
+    data_store._store = store
+    return store
@@ -0,0 +1,114 @@
+"""
+Change detection between two scrapes.
+
+Every table in a dataset gets a content fingerprint. A refresh whose
+fingerprints match the current snapshot is skipped entirely, and otherwise
+only the tables that changed are diffed row by row.
+"""
+import hashlib
+
+import pandas as pd
+
+# Table name -> columns that identify a row
+KEYS = {
+    'field_players': ['Player'],
+    'goalies': ['Player'],
+    'previous_field_players': ['Player'],
+    'previous_goalies': ['Player'],
+    'games': ['Date', 'Opponent'],
+    'roster': ['Name'],
+}
+
+
+def dataset_tables(data):
+    """
+    Flattens a scrape_all_data result into named DataFrames
+    """
+    if not data:
+        return {}
+    tables = {}
+    for prefix, key in (('', 'current_stats'), ('previous_', 'previous_stats')):
+        stats = data.get(key)
+        if stats:
+            tables[f'{prefix}field_players'] = stats['field_players']
+            tables[f'{prefix}goalies'] = stats['goalies']
+    if data.get('fixtures'):
+        tables['games'] = data['fixtures']['games']
+    if data.get('roster') is not None:
+        tables['roster'] = data['roster']
+    return tables
+
+
+def fingerprint(df):
+    """
+    Content hash of a DataFrame (columns and values, not the index)
+    """
+    digest = hashlib.sha1(",".join(map(str, df.columns)).encode("utf-8"))
+    if not df.empty:
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def fingerprints(data):
+    fps = {name: fingerprint(df) for name, df in dataset_tables(data).items()}
+    if data and data.get('fixtures'):
+        fps['coach'] = hashlib.sha1(str(data['fixtures']['coach']).encode("utf-8")).hexdigest()
+    return fps
+
+
+def diff_table(old, new, key):
+    """
+    Row-level diff of two versions of a table:
+    {'added': [rows], 'removed': [rows], 'changed': [{'key', 'before', 'after'}]}
+    """
+    if old is None or old.empty:
+        return {'added': new.to_dict(orient='records'), 'removed': [], 'changed': []}
+    if new is None or new.empty:
+        return {'added': [], 'removed': old.to_dict(orient='records'), 'changed': []}
+
+    merged = old.merge(new, on=key, how='outer', suffixes=('_old', '_new'), indicator=True)
+    values = [c for c in new.columns if c not in key and c in old.columns]
+
+    added = new.merge(merged.loc[merged['_merge'] == 'right_only', key], on=key)
+    removed = old.merge(merged.loc[merged['_merge'] == 'left_only', key], on=key)
+
+    both = merged[merged['_merge'] == 'both']
+    differs = pd.Series(False, index=both.index)
+    for column in values:
+        # As objects, so categoricals with different categories still compare
+        before, after = both[f'{column}_old'].astype(object), both[f'{column}_new'].astype(object)
+        differs |= ~((before == after) | (before.isna() & after.isna()))
+
+    changed = [
+        {
+            'key': {k: row[k] for k in key},
+            'before': {c: row[f'{c}_old'] for c in values},
+            'after': {c: row[f'{c}_new'] for c in values},
+        }
+        for row in both[differs].to_dict(orient='records')
+    ]
+    return {'added': added.to_dict(orient='records'), 'removed': removed.to_dict(orient='records'), 'changed': changed}
+
+
+def diff_datasets(old_data, new_data, old_fingerprints=None, new_fingerprints=None):
+    """
+    Structured diff between two datasets, e.g.
+    {'games': {'added': [new games], ...}, 'field_players': {'changed': [player lines], ...}}
+    Only tables whose fingerprint changed are compared and included.
+    """
+    old_fingerprints = old_fingerprints if old_fingerprints is not None else fingerprints(old_data)
+    new_fingerprints = new_fingerprints if new_fingerprints is not None else fingerprints(new_data)
+    old_tables = dataset_tables(old_data)
+    new_tables = dataset_tables(new_data)
+
+    diff = {}
+    for name, new in new_tables.items():
+        if old_fingerprints.get(name) == new_fingerprints.get(name):
+            continue
+        diff[name] = diff_table(old_tables.get(name), new, KEYS[name])
+    for name, old in old_tables.items():
+        if name not in new_tables:
+            diff[name] = {'added': [], 'removed': old.to_dict(orient='records'), 'changed': []}
+    if old_fingerprints.get('coach') != new_fingerprints.get('coach') and new_data.get('fixtures'):
+        diff['coach'] = new_data['fixtures']['coach']
+    return diff
@@ -0,0 +1,90 @@
+import os
+
+# Settings can be overridden with environment variables so the scraper can be
+# pointed at a local stub server or tuned without editing code.
+
+# Root of the nj.com high school sports site
+BASE_URL = os.environ.get("EDISON_BASE_URL", "https://highschoolsports.nj.com").rstrip("/")
+
+# School and sport scraped by default (nj.com URL slugs)
+SCHOOL = os.environ.get("EDISON_SCHOOL", "edison-edison")
+SPORT = os.environ.get("EDISON_SPORT", "boyssoccer")
+
+# Max number of pages fetched at the same time by scrape_all_data
+SCRAPE_MAX_WORKERS = int(os.environ.get("EDISON_SCRAPE_MAX_WORKERS", "4"))
+
+# Per-request timeout in seconds
+SCRAPE_TIMEOUT = float(os.environ.get("EDISON_SCRAPE_TIMEOUT", "15"))
+
+# On-disk HTTP response cache
+HTTP_CACHE_ENABLED = os.environ.get("EDISON_HTTP_CACHE", "1") != "0"
+HTTP_CACHE_DIR = os.environ.get(
+    "EDISON_HTTP_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "http"),
+)
+# Seconds a cached page is served without asking nj.com again
+HTTP_CACHE_TTL = float(os.environ.get("EDISON_HTTP_CACHE_TTL", "900"))
+# Least recently used pages are evicted once the cache grows past this size
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("EDISON_HTTP_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# Shared HTTP client
+HTTP_POOL_SIZE = int(os.environ.get("EDISON_HTTP_POOL_SIZE", "8"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("EDISON_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_RETRIES = int(os.environ.get("EDISON_HTTP_MAX_RETRIES", "3"))
+# Retry n waits backoff_factor * 2**n seconds plus up to HTTP_BACKOFF_JITTER of random jitter
+HTTP_BACKOFF_FACTOR = float(os.environ.get("EDISON_HTTP_BACKOFF_FACTOR", "0.5"))
+HTTP_BACKOFF_JITTER = float(os.environ.get("EDISON_HTTP_BACKOFF_JITTER", "0.5"))
+# Requests per second sent to nj.com across all threads (0 disables the limit)
+HTTP_RATE_LIMIT = float(os.environ.get("EDISON_HTTP_RATE_LIMIT", "4"))
+
+# Shared in-memory dataset used by the dashboard
+# Seconds before the dataset is considered stale and refreshed in the background
+DATA_TTL = float(os.environ.get("EDISON_DATA_TTL", "600"))
+# Seconds to wait before scraping again when there is no data at all yet
+# (the first scrape failed and nothing was saved)
+REFRESH_RETRY_DELAY = float(os.environ.get("EDISON_REFRESH_RETRY_DELAY", "60"))
+
+# Background refresh scheduler
+SCHEDULER_ENABLED = os.environ.get("EDISON_SCHEDULER", "1") != "0"
+# Seconds between refreshes on normal days and on days Edison plays
+REFRESH_INTERVAL = float(os.environ.get("EDISON_REFRESH_INTERVAL", "3600"))
+REFRESH_INTERVAL_GAME_DAY = float(os.environ.get("EDISON_REFRESH_INTERVAL_GAME_DAY", "300"))
+
+# HTML parsing backend, see parsers.BACKENDS
+PARSER_BACKEND = os.environ.get("EDISON_PARSER_BACKEND", "")
+
+# Bulk historical ingestion
+INGEST_DIR = os.environ.get(
+    "EDISON_INGEST_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ingest"),
+)
+INGEST_MAX_WORKERS = int(os.environ.get("EDISON_INGEST_MAX_WORKERS", "4"))
+
+# Local SQLite database the scraped tables are persisted to
+STORE_ENABLED = os.environ.get("EDISON_STORE", "1") != "0"
+STORE_PATH = os.environ.get(
+    "EDISON_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "stats.db"),
+)
+
+# Pre-serialised API responses kept per snapshot
+API_CACHE_MAX_ENTRIES = int(os.environ.get("EDISON_API_CACHE_MAX_ENTRIES", "2048"))
+# Responses smaller than this are sent uncompressed
+API_COMPRESS_MIN_BYTES = int(os.environ.get("EDISON_API_COMPRESS_MIN_BYTES", "500"))
+
+# Analytics agent (the Anthropic client reads ANTHROPIC_API_KEY itself)
+AGENT_MODEL = os.environ.get("EDISON_AGENT_MODEL", "claude-sonnet-4-20250514")
+AGENT_MAX_TOKENS = int(os.environ.get("EDISON_AGENT_MAX_TOKENS", "4096"))
+# Model round trips allowed per question before giving up on tool calls
+AGENT_MAX_TURNS = int(os.environ.get("EDISON_AGENT_MAX_TURNS", "5"))
+# Tokens (input + output) one question may use across all its round trips
+AGENT_REQUEST_TOKEN_BUDGET = int(os.environ.get("EDISON_AGENT_REQUEST_TOKEN_BUDGET", "20000"))
+# Tokens the whole process may use per hour (0 = no limit)
+AGENT_HOURLY_TOKEN_BUDGET = int(os.environ.get("EDISON_AGENT_HOURLY_TOKEN_BUDGET", "500000"))
+# Answers kept per snapshot
+AGENT_ANSWER_CACHE_SIZE = int(os.environ.get("EDISON_AGENT_ANSWER_CACHE_SIZE", "500"))
+
+# Timing spans and cache counters, exported at /metrics (0 turns recording off)
+METRICS_ENABLED = os.environ.get("EDISON_METRICS", "1") != "0"
+# Always show the dashboard's debug metrics panel (otherwise only with ?debug=1)
+DEBUG_PANEL = os.environ.get("EDISON_DEBUG_PANEL", "0") == "1"
@@ -0,0 +1,222 @@
+import threading
+import time
+from dataclasses import dataclass, field, replace
+
+import config
+import instrumentation
+from aggregates import build_aggregates
+from changes import diff_datasets, fingerprints
+from scraper import scrape_all_data
+from store import get_stats_store
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    One complete scrape of the season data plus when it was taken.
+    Snapshots are never modified: a refresh builds a new one and swaps it in
+    with a single assignment, so a reader holding a snapshot always sees a
+    consistent dataset. Copy a table before changing it.
+    """
+    data: dict
+    version: int
+    created_at: float
+    # Content hash of every table, see changes.fingerprints
+    fingerprints: dict = field(default_factory=dict)
+    # What changed since the previous snapshot, see changes.diff_datasets
+    changes: dict = field(default_factory=dict)
+    # Season totals, record and leaders, see aggregates.build_aggregates
+    aggregates: dict = field(default_factory=dict)
+
+    @property
+    def age(self):
+        return time.time() - self.created_at
+
+    @property
+    def usable(self):
+        # Same test a scrape has to pass to become a snapshot, see has_data
+        return has_data(self.data)
+
+
+def has_data(data):
+    """
+    True if a scraped or saved dataset is worth serving: it has current
+    field players. A page that parses to no players is a failed scrape, not
+    an empty season.
+    """
+    stats = (data or {}).get('current_stats')
+    return bool(stats) and stats.get('field_players') is not None and not stats['field_players'].empty
+
+
+class DataStore:
+    """
+    Process-wide holder for the scraped dataset, shared by every viewer.
+
+    Reads never scrape once a snapshot exists: a stale snapshot is returned
+    immediately while a single background refresh replaces it
+    (stale-while-revalidate). Concurrent refreshes collapse into one scrape.
+    Every refresh is saved to the local stats store, and a fresh process
+    starts from the last saved dataset instead of scraping.
+
+    A refresh that finds exactly the same tables keeps the current snapshot
+    and its version, so anything derived from it stays valid. Otherwise the
+    new snapshot carries a diff of what changed and subscribers are notified.
+
+    An empty or failed scrape, including one that parses to no players,
+    never becomes a snapshot. Without any data
+    yet, get() and refresh() return None and the scrape is retried after
+    retry_delay seconds.
+    """
+
+    def __init__(self, loader=scrape_all_data, ttl=None, stats_store=None, retry_delay=None):
+        self.loader = loader
+        self.ttl = config.DATA_TTL if ttl is None else ttl
+        self.retry_delay = config.REFRESH_RETRY_DELAY if retry_delay is None else retry_delay
+        self.stats_store = stats_store
+        self._snapshot = None
+        # When the last scrape without any data to fall back on failed
+        self._failed_at = None
+        self._refresh_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._subscribers = []
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def refreshing(self):
+        return self._refresh_lock.locked()
+
+    @property
+    def retry_pending(self):
+        """
+        True while there is no data and the last scrape failed less than
+        retry_delay seconds ago
+        """
+        return (self._snapshot is None and self._failed_at is not None
+                and time.time() - self._failed_at < self.retry_delay)
+
+    def get(self):
+        """
+        Returns the current snapshot, blocking only for the very first load.
+        Returns None if there is no data yet and the first scrape failed.
+        """
+        snapshot = self._snapshot or self.load_persisted()
+        if snapshot is None:
+            return None if self.retry_pending else self.refresh()
+        if snapshot.age > self.ttl:
+            self.refresh_async()
+        return snapshot
+
+    def load_persisted(self):
+        """
+        Loads the last saved dataset as the first snapshot, if there is one
+        """
+        if self.stats_store is None:
+            return self._snapshot
+        with self._load_lock:
+            if self._snapshot is None:
+                try:
+                    data, saved_at = self.stats_store.load_dataset()
+                except Exception as e:
+                    print(f"❌ Error loading saved data: {e}")
+                    data, saved_at = None, None
+                if has_data(data) and self._snapshot is None:
+                    self._snapshot = Snapshot(data=data, version=1, created_at=saved_at, fingerprints=fingerprints(data),
+                                              aggregates=build_aggregates(data))
+            return self._snapshot
+
+    def subscribe(self, callback):
+        """
+        Calls callback(snapshot) whenever a refresh produces changed data;
+        snapshot.changes says what changed
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def refresh(self):
+        """
+        Scrapes now and returns the new snapshot. If another refresh is already
+        running, waits for it and returns its result instead of scraping again.
+        Returns None if the scrape failed and there is no earlier snapshot.
+        """
+        seen = self._snapshot
+        failed_at = self._failed_at
+        with self._refresh_lock:
+            current = self._snapshot
+            if current is not seen or self._failed_at != failed_at:
+                return current
+            
+            # Conditional requests keep this cheap when nothing changed on nj.com
+            with instrumentation.span('scrape'):
+                data = self.loader(revalidate=True)
+            if not has_data(data):
+                if current is None:
+                    self._failed_at = time.time()
+                    print(f"❌ Scrape returned no data, retrying in {self.retry_delay:.0f}s")
+                    return None
+                # Keep serving the last good data rather than an empty scrape
+                print("❌ Refresh failed, keeping previous snapshot")
+                return current
+            self._failed_at = None
+            
+            new_fingerprints = fingerprints(data)
+            if current is not None and new_fingerprints == current.fingerprints:
+                # Nothing changed: same version, only the timestamp moves
+                self._snapshot = replace(current, created_at=time.time())
+                return self._snapshot
+            
+            changes = diff_datasets(current.data, data, current.fingerprints, new_fingerprints) if current else {}
+            
+            if self.stats_store is not None and has_data(data):
+                try:
+                    changed = self.stats_store.save_dataset(data)
+                    print(f"✅ Saved {changed} changed rows")
+                except Exception as e:
+                    print(f"❌ Error saving data: {e}")
+            
+            version = current.version + 1 if current else 1
+            snapshot = Snapshot(data=data, version=version, created_at=time.time(),
+                                fingerprints=new_fingerprints, changes=changes, aggregates=build_aggregates(data))
+            self._snapshot = snapshot
+        
+        for callback in list(self._subscribers):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"❌ Snapshot subscriber failed: {e}")
+        return snapshot
+
+    def refresh_async(self):
+        """
+        Starts a background refresh unless one is already running or a failed
+        first scrape is still waiting out its retry delay
+        """
+        if self._refresh_lock.locked() or self.retry_pending:
+            return
+        threading.Thread(target=self.refresh, name="data-refresh", daemon=True).start()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    Returns the DataStore shared by everything running in this process
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DataStore(stats_store=get_stats_store() if config.STORE_ENABLED else None)
+        return _store
+
+
+def _served(attribute):
+    snapshot = _store.snapshot if _store is not None else None
+    return getattr(snapshot, attribute) if snapshot is not None else None
+
+
+instrumentation.gauge('snapshot_age_seconds', lambda: _served('age'), help="Seconds since the served snapshot was scraped")
+instrumentation.gauge('snapshot_version', lambda: _served('version'), help="Version of the served snapshot")
@@ -0,0 +1,71 @@
+"""
+Streams whole snapshot tables as NDJSON or Arrow IPC.
+
+Both encoders work on column blocks (pandas' C JSON writer, Arrow record
+batches), so no Python dict is created per row.
+"""
+import io
+
+from changes import dataset_tables
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+ROWS_PER_CHUNK = 1000
+
+
+def export_tables(snapshot):
+    return dataset_tables(snapshot.data)
+
+
+def ndjson_chunks(df, rows_per_chunk=ROWS_PER_CHUNK):
+    for start in range(0, len(df), rows_per_chunk):
+        chunk = df.iloc[start:start + rows_per_chunk].to_json(orient='records', lines=True, force_ascii=False, date_format='iso')
+        yield chunk.encode('utf-8') if chunk.endswith('\n') else (chunk + '\n').encode('utf-8')
+
+
+class _PendingBytes(io.RawIOBase):
+    """
+    Write target that hands back whatever was written since the last take()
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def arrow_chunks(df, rows_per_chunk=ROWS_PER_CHUNK):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pending = _PendingBytes()
+    writer = pa.ipc.new_stream(pending, table.schema)
+    # Schema message with the first batch, then one message per record batch
+    for batch in table.to_batches(max_chunksize=rows_per_chunk):
+        writer.write_batch(batch)
+        yield pending.take()
+    # End-of-stream marker (and the schema, for an empty table)
+    writer.close()
+    yield pending.take()
+
+
+def export_chunks(df, fmt):
+    if fmt == 'arrow':
+        return arrow_chunks(df)
+    return ndjson_chunks(df)
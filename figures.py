@@ -0,0 +1,210 @@
+"""
+Plotly figures for the dashboard, built once per data snapshot.
+
+Every chart shares one layout template, and each figure is memoised by
+(kind, snapshot version, sort key), so reruns caused by widget
+interactions reuse the same Figure instead of rebuilding it.
+"""
+import threading
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from instrumentation import cache_result, span
+from metrics import get_metrics
+
+BASE_LAYOUT = dict(
+    margin=dict(l=20, r=20, t=20, b=20),
+    plot_bgcolor='white',
+    paper_bgcolor='white',
+    font=dict(color='#1a1a1a'),
+)
+GRID = dict(showgrid=True, gridcolor='#f1f5f9')
+BAR_OUTLINE = dict(color='white', width=2)
+
+TOP_SCORER_COLORS = ['#DC143C', '#E31C42', '#EA2348', '#F12A4E', '#F73154',
+                     '#FE385A', '#FF5270', '#FF6C86', '#FF869C', '#FFD700']
+
+
+def styled(traces, height, **layout):
+    """
+    A Figure with the shared dashboard layout, plus per-chart overrides
+    """
+    fig = go.Figure(data=traces)
+    fig.update_layout(height=height, **{**BASE_LAYOUT, **layout})
+    return fig
+
+
+def _stats(snapshot):
+    stats = snapshot.data.get('current_stats') or {}
+    return stats.get('field_players', pd.DataFrame()), stats.get('goalies', pd.DataFrame())
+
+
+def top_scorers(snapshot, sort_by):
+    field, _ = _stats(snapshot)
+    top = field.sort_values(sort_by, ascending=False, kind='stable').head(10)
+    return styled([
+        go.Bar(
+            x=top['Goals'],
+            y=top['Player'],
+            orientation='h',
+            marker=dict(color=TOP_SCORER_COLORS[:len(top)], line=BAR_OUTLINE),
+            text=top['Goals'],
+            textposition='outside',
+            textfont=dict(size=14, color='#1a1a1a', family='Inter')
+        )
+    ], 400, xaxis=dict(**GRID, title='Goals'), yaxis=dict(autorange="reversed"))
+
+
+def goals_vs_assists(snapshot, sort_by=None):
+    field, _ = _stats(snapshot)
+    return styled([
+        go.Scatter(
+            x=field['Assists'],
+            y=field['Goals'],
+            mode='markers',
+            marker=dict(
+                size=field['Points']*3 + 8,
+                color=field['Points'],
+                colorscale=[[0, '#FFD700'], [0.5, '#DC143C'], [1, '#8B0000']],
+                showscale=True,
+                colorbar=dict(title="Points"),
+                line=BAR_OUTLINE
+            ),
+            text=field['Player'],
+            hovertemplate='<b>%{text}</b><br>Goals: %{y}<br>Assists: %{x}<extra></extra>'
+        )
+    ], 400, xaxis=dict(**GRID, title='Assists'), yaxis=dict(**GRID, title='Goals'))
+
+
+def _goalie_bars(goalies, values, colors):
+    return styled([
+        go.Bar(
+            x=goalies['Player'],
+            y=values,
+            marker=dict(color=colors[:len(goalies)], line=BAR_OUTLINE),
+            text=values,
+            textposition='outside',
+            textfont=dict(color='#1a1a1a')
+        )
+    ], 350, xaxis=dict(tickangle=-45), yaxis=GRID)
+
+
+def goalie_saves(snapshot, sort_by=None):
+    _, goalies = _stats(snapshot)
+    return _goalie_bars(goalies, goalies['Saves'], ['#DC143C', '#E92952', '#FFD700', '#F73F68'])
+
+
+def goalie_saves_per_game(snapshot, sort_by=None):
+    goalies = get_metrics(snapshot).goalies
+    return _goalie_bars(goalies, goalies['Saves Per Game'], ['#FFD700', '#DC143C', '#E92952', '#F73F68'])
+
+
+def season_record(snapshot, sort_by=None):
+    outcome_counts = get_metrics(snapshot).outcomes
+    return styled([
+        go.Pie(
+            labels=outcome_counts.index,
+            values=outcome_counts.values,
+            hole=0.4,
+            marker=dict(colors=['#DC143C', '#8B0000', '#FFD700']),
+            textfont=dict(size=16, color='white', family='Inter')
+        )
+    ], 400, margin=dict(l=20, r=20, t=40, b=20),
+        title=dict(text="Season Record", font=dict(size=20, color='#1a1a1a')))
+
+
+def positions(snapshot, sort_by=None):
+    position_counts = get_metrics(snapshot).positions
+    return styled([
+        go.Bar(
+            x=position_counts.index,
+            y=position_counts.values,
+            marker=dict(color='#DC143C', line=BAR_OUTLINE),
+            text=position_counts.tolist(),
+            textposition='outside',
+            textfont=dict(color='#1a1a1a')
+        )
+    ], 350, xaxis=dict(title='Position'), yaxis=dict(**GRID, title='Players'))
+
+
+def _season_comparison(snapshot, column, colors):
+    aggregates = snapshot.aggregates
+    totals = [aggregates['previous'][column], aggregates['current'][column]]
+    return styled([
+        go.Bar(
+            x=[aggregates['previous']['season'], aggregates['current']['season']],
+            y=totals,
+            marker=dict(color=colors, line=BAR_OUTLINE),
+            text=totals,
+            textposition='outside',
+            textfont=dict(size=18, color='#1a1a1a')
+        )
+    ], 350, yaxis=GRID)
+
+
+def goals_comparison(snapshot, sort_by=None):
+    return _season_comparison(snapshot, 'goals', ['#8B0000', '#DC143C'])
+
+
+def assists_comparison(snapshot, sort_by=None):
+    return _season_comparison(snapshot, 'assists', ['#FFB700', '#FFD700'])
+
+
+def _histogram(values, bins, color, title):
+    return styled([
+        go.Histogram(
+            x=values,
+            nbinsx=bins,
+            marker=dict(color=color, line=dict(color='white', width=1))
+        )
+    ], 300, xaxis=dict(**GRID, title=title), yaxis=dict(**GRID, title='Players'))
+
+
+def points_histogram(snapshot, sort_by=None):
+    field, _ = _stats(snapshot)
+    return _histogram(field['Points'], 15, '#DC143C', 'Points')
+
+
+def goals_histogram(snapshot, sort_by=None):
+    field, _ = _stats(snapshot)
+    return _histogram(field['Goals'], 12, '#FFD700', 'Goals')
+
+
+FIGURES = {
+    'top_scorers': top_scorers,
+    'goals_vs_assists': goals_vs_assists,
+    'goalie_saves': goalie_saves,
+    'goalie_saves_per_game': goalie_saves_per_game,
+    'season_record': season_record,
+    'positions': positions,
+    'goals_comparison': goals_comparison,
+    'assists_comparison': assists_comparison,
+    'points_histogram': points_histogram,
+    'goals_histogram': goals_histogram,
+}
+
+_figures = {}
+_figures_lock = threading.Lock()
+
+
+def get_figure(kind, snapshot, sort_by=None):
+    """
+    Returns the figure of this kind for snapshot, building it only once per
+    (kind, snapshot version, sort key). Figures from older snapshots are dropped.
+    """
+    key = (kind, snapshot.version, sort_by)
+    fig = _figures.get(key)
+    if fig is not None:
+        cache_result('figures', 'hit')
+        return fig
+    with _figures_lock:
+        fig = _figures.get(key)
+        if fig is None:
+            cache_result('figures', 'miss')
+            with span('figure', kind=kind):
+                fig = FIGURES[kind](snapshot, sort_by)
+            for stale in [k for k in _figures if k[1] != snapshot.version]:
+                del _figures[stale]
+            _figures[key] = fig
+        return fig
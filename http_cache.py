@@ -0,0 +1,108 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+import config
+
+
+class ResponseCache:
+    """
+    Persistent page cache keyed by URL.
+
+    Each entry is one pickle file holding the response body, its validators
+    (ETag / Last-Modified) and the parsed result, so a hit skips both the
+    network and the HTML parse. File mtimes double as LRU access times.
+    """
+
+    def __init__(self, directory, max_bytes, ttl):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".pkl")
+
+    def get(self, url):
+        path = self._path(url)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+            os.utime(path)  # mark as recently used
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or unreadable entry, drop it and refetch
+            self._remove(path)
+            return None
+
+    def put(self, url, entry):
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def is_fresh(self, entry):
+        # Finished seasons never change, so their pages never expire
+        if entry.get("forever"):
+            return True
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def evict(self):
+        """
+        Removes least recently used entries until the cache fits in max_bytes
+        """
+        with self._lock:
+            files = []
+            total = 0
+            for name in os.listdir(self.directory):
+                if not name.endswith(".pkl"):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            files.sort()
+            for _, size, path in files:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    def clear(self):
+        with self._lock:
+            for name in os.listdir(self.directory):
+                self._remove(os.path.join(self.directory, name))
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    Returns the shared ResponseCache, or None when caching is disabled
+    """
+    global _cache
+    if not config.HTTP_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(config.HTTP_CACHE_DIR, config.HTTP_CACHE_MAX_BYTES, config.HTTP_CACHE_TTL)
+        return _cache
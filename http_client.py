@@ -0,0 +1,91 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+from instrumentation import span
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread, so all scrapers together stay under
+    `rate` requests per second while still allowing short bursts.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def create_session(pool_size=None, max_retries=None):
+    """
+    Builds a keep-alive session with a connection pool and retry/backoff on
+    connection errors, 429 and 5xx responses
+    """
+    retry = Retry(
+        total=config.HTTP_MAX_RETRIES if max_retries is None else max_retries,
+        backoff_factor=config.HTTP_BACKOFF_FACTOR,
+        backoff_jitter=config.HTTP_BACKOFF_JITTER,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+    )
+    pool_size = pool_size or config.HTTP_POOL_SIZE
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_session = None
+_limiter = RateLimiter(config.HTTP_RATE_LIMIT)
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def get(url, headers=None, timeout=None):
+    """
+    GET through the shared pooled session, throttled by the global rate limit.
+    timeout is the read timeout in seconds; the connect timeout comes from config.
+    """
+    _limiter.acquire()
+    with span("fetch"):
+        return get_session().get(
+            url,
+            headers=headers,
+            timeout=(config.HTTP_CONNECT_TIMEOUT, timeout or config.SCRAPE_TIMEOUT),
+        )
@@ -0,0 +1,150 @@
+"""
+Lookup indexes built once per data snapshot.
+
+API handlers and the agent answer from these dicts and pre-sorted lists
+instead of scanning DataFrames on every request.
+"""
+import threading
+from dataclasses import dataclass
+
+import pandas as pd
+
+from instrumentation import timed
+from names import NameIndex, link_names, normalize as normalize_name
+
+
+def clean_opponent(name):
+    """
+    Strips the "vs "/"@ " prefixes and line breaks nj.com puts around opponent names
+    """
+    name = " ".join(str(name).split())
+    for prefix in ("vs ", "@ "):
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+    return name.strip()
+
+
+FIELD_COLUMNS = {'Player': 'player', 'Year': 'year', 'Position': 'position', 'Goals': 'goals',
+                 'Assists': 'assists', 'Points': 'points'}
+GOALIE_COLUMNS = {'Player': 'player', 'Year': 'year', 'Position': 'position', 'Saves': 'saves',
+                  'Games Played': 'games_played'}
+GAME_COLUMNS = {'Date': 'date', 'Location': 'location', 'Result': 'result', 'Outcome': 'outcome',
+                'Goals For': 'goals_for', 'Goals Against': 'goals_against'}
+ROSTER_COLUMNS = {'Number': 'number', 'Name': 'name', 'Position': 'position', 'Year': 'year'}
+
+
+@dataclass(frozen=True)
+class SnapshotIndex:
+    version: int
+    # normalised player name -> player record
+    players: dict
+    # field player records, best scorer first
+    top_scorers: list
+    # normalised opponent name -> {'opponent', 'games', 'record'}
+    opponents: dict
+    # fuzzy resolvers over the player and opponent names above
+    player_names: NameIndex
+    opponent_names: NameIndex
+    # current players who also played last season
+    returning_players: frozenset
+
+
+def _records(df, columns):
+    if df is None or df.empty:
+        return []
+    present = {k: v for k, v in columns.items() if k in df.columns}
+    frame = df[list(present)].rename(columns=present)
+    # Plain JSON values: ISO dates, None for missing scores/dates
+    for column in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[column]):
+            frame[column] = frame[column].dt.strftime('%Y-%m-%d')
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient='records')
+
+
+@timed('index')
+def build_index(snapshot):
+    data = snapshot.data
+    stats = data.get('current_stats') or {}
+    field = stats.get('field_players', pd.DataFrame())
+    goalies = stats.get('goalies', pd.DataFrame())
+
+    players = {}
+    for record in _records(field, FIELD_COLUMNS):
+        players[normalize_name(record['player'])] = {**record, 'role': 'field'}
+    for record in _records(goalies, GOALIE_COLUMNS):
+        games = record['games_played']
+        record['saves_per_game'] = round(record['saves'] / games, 2) if games else 0
+        key = normalize_name(record['player'])
+        # A keeper who also has field stats keeps both sets of numbers
+        players[key] = {**players.get(key, {}), **record, 'role': 'goalkeeper' if key not in players else 'field+goalkeeper'}
+
+    # Link each player to their roster entry and last season's line
+    player_names = NameIndex([record['player'] for record in players.values()])
+    roster = {record['name']: record for record in _records(data.get('roster'), ROSTER_COLUMNS)}
+    for player, name in link_names(player_names.names, list(roster)).items():
+        players[normalize_name(player)]['roster'] = roster[name]
+    
+    previous = (data.get('previous_stats') or {}).get('field_players')
+    previous_lines = {record['player']: record for record in _records(previous, FIELD_COLUMNS)}
+    previous_links = link_names(player_names.names, list(previous_lines))
+    for player, name in previous_links.items():
+        players[normalize_name(player)]['previous_season'] = previous_lines[name]
+
+    if field is not None and not field.empty:
+        ordered = field.sort_values(['Goals', 'Points', 'Assists'], ascending=False, kind='stable')
+        top_scorers = _records(ordered, FIELD_COLUMNS)
+    else:
+        top_scorers = []
+
+    opponents = {}
+    fixtures = data.get('fixtures') or {}
+    games = fixtures.get('games', pd.DataFrame())
+    if games is not None and not games.empty:
+        names = games['Opponent'].map(clean_opponent)
+        for name, record in zip(names, _records(games, GAME_COLUMNS)):
+            record['result'] = " ".join(str(record['result']).split())
+            entry = opponents.setdefault(normalize_name(name), {
+                'opponent': name, 'games': [], 'record': {'wins': 0, 'losses': 0, 'ties': 0},
+            })
+            entry['games'].append(record)
+            outcome = {'W': 'wins', 'L': 'losses', 'T': 'ties'}.get(record['outcome'])
+            if outcome:
+                entry['record'][outcome] += 1
+
+    return SnapshotIndex(
+        version=snapshot.version,
+        players=players,
+        top_scorers=top_scorers,
+        opponents=opponents,
+        player_names=player_names,
+        opponent_names=NameIndex([entry['opponent'] for entry in opponents.values()]),
+        returning_players=frozenset(previous_links),
+    )
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def peek_index(snapshot):
+    """
+    Returns the index for snapshot if it is already built, else None
+    """
+    index = _index
+    if index is not None and index.version == snapshot.version:
+        return index
+    return None
+
+
+def get_index(snapshot):
+    """
+    Returns the index for snapshot, building it only when the version changes
+    """
+    global _index
+    index = _index
+    if index is not None and index.version == snapshot.version:
+        return index
+    with _index_lock:
+        if _index is None or _index.version != snapshot.version:
+            _index = build_index(snapshot)
+        return _index
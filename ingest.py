@@ -0,0 +1,197 @@
+"""
+Bulk ingestion of historical seasons for one or more schools.
+
+Pages are fetched in parallel with bounded concurrency and each page's rows
+are written to storage as soon as it arrives. Finished pages are recorded by
+the sink, so a rerun after a crash only fetches what is missing.
+
+    python ingest.py --schools edison-edison,piscataway-piscataway --from 2015-2016 --to 2024-2025
+"""
+import argparse
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import groupby, islice
+from operator import itemgetter
+
+import config
+from scraper import fetch_html, iter_roster_rows, iter_schedule_rows, iter_stats_rows, season_url
+from seasons import is_historical_season, season_range
+from store import get_stats_store
+
+# Page name -> (URL suffix, row generator, tables it yields)
+PAGES = {
+    'stats': ('stats', iter_stats_rows, ('field_players', 'goalies')),
+    'schedule': ('', iter_schedule_rows, ('games',)),
+    'roster': ('roster', iter_roster_rows, ('roster',)),
+}
+
+
+def page_rows(task, html):
+    """
+    Yields (table, record) for every row of a fetched page
+    """
+    school, sport, season, page = task
+    if page == 'schedule':
+        # Schedule dates leave out the year, which comes from the season
+        return iter_schedule_rows(html, season=season)
+    return PAGES[page][1](html)
+
+
+def _json_value(value):
+    # Timestamps are the only non-JSON values in parsed records
+    return value.isoformat()
+
+
+class JsonlSink:
+    """
+    Writes each page's rows to <root>/<school>/<sport>/<season>/<page>.jsonl.
+    Files are written to a temp name and renamed, so a page file only exists
+    once all of its rows are on disk; that file is the resume checkpoint.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or config.INGEST_DIR
+
+    def _path(self, task):
+        school, sport, season, page = task
+        return os.path.join(self.root, school, sport, season, f"{page}.jsonl")
+
+    def is_done(self, task):
+        return os.path.exists(self._path(task))
+
+    def write(self, task, rows):
+        """
+        Writes (table, record) pairs as they come; returns the row count
+        """
+        school, sport, season, page = task
+        path = self._path(task)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        count = 0
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for table, record in rows:
+                line = {**record, 'table': table, 'school': school, 'sport': sport, 'season': season}
+                f.write(json.dumps(line, default=_json_value) + "\n")
+                count += 1
+        os.replace(tmp_path, path)
+        return count
+
+
+class SqliteSink:
+    """
+    Upserts each page's rows into the local stats store and records finished
+    pages in its ingest_pages table
+    """
+
+    def __init__(self, stats_store=None):
+        self.stats_store = stats_store or get_stats_store()
+
+    def is_done(self, task):
+        return self.stats_store.is_page_done(*task)
+
+    def write(self, task, rows):
+        """
+        Streams (table, record) pairs into the store one table at a time;
+        returns the row count
+        """
+        school, sport, season, page = task
+        count = 0
+        written = set()
+        
+        def records(group):
+            nonlocal count
+            for _, record in group:
+                count += 1
+                yield record
+        
+        for table, group in groupby(rows, key=itemgetter(0)):
+            self.stats_store.upsert_rows(table, records(group), school, sport, season)
+            written.add(table)
+        # A table with no rows on the page still replaces what was stored
+        for table in PAGES[page][2]:
+            if table not in written:
+                self.stats_store.upsert_rows(table, [], school, sport, season)
+        self.stats_store.mark_page_done(*task)
+        return count
+
+
+SINKS = {'sqlite': SqliteSink, 'jsonl': JsonlSink}
+
+
+def fetch_page(task, timeout=None):
+    school, sport, season, page = task
+    url = season_url(season, PAGES[page][0], school=school, sport=sport)
+    return fetch_html(url, timeout=timeout, cache_forever=is_historical_season(season))
+
+
+def ingest(schools, seasons, sport=None, pages=None, sink=None, max_workers=None, resume=True, timeout=None):
+    """
+    Fetches every (school, season, page) combination and streams the rows into
+    sink. Returns counts of fetched, skipped and failed pages.
+    """
+    sport = sport or config.SPORT
+    pages = pages or list(PAGES)
+    sink = sink or SqliteSink()
+    
+    tasks = [(school, sport, season, page) for school in schools for season in seasons for page in pages]
+    todo = [task for task in tasks if not (resume and sink.is_done(task))]
+    summary = {'fetched': 0, 'skipped': len(tasks) - len(todo), 'failed': 0, 'rows': 0}
+    
+    print(f"🔄 Ingesting {len(todo)} pages ({summary['skipped']} already done)...")
+    
+    workers = max_workers or config.INGEST_MAX_WORKERS
+    queue = iter(todo)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+        # Only a window of pages is fetched ahead of the writer and each page's
+        # HTML is dropped once written, so memory stays flat however many
+        # pages the backfill covers
+        pending = {pool.submit(fetch_page, task, timeout): task for task in islice(queue, 2 * workers)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = pending.pop(future)
+                try:
+                    # Parsed and written from this thread only, row by row as each page completes
+                    rows = sink.write(task, page_rows(task, future.result()))
+                except Exception as e:
+                    summary['failed'] += 1
+                    print(f"❌ Error ingesting {'/'.join(task)}: {e}")
+                else:
+                    summary['fetched'] += 1
+                    summary['rows'] += rows
+                next_task = next(queue, None)
+                if next_task is not None:
+                    pending[pool.submit(fetch_page, next_task, timeout)] = next_task
+    
+    print(f"✅ Ingested {summary['fetched']} pages, {summary['rows']} rows ({summary['failed']} failed)")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill historical seasons from nj.com")
+    parser.add_argument("--schools", default=config.SCHOOL, help="comma-separated school slugs")
+    parser.add_argument("--sport", default=config.SPORT)
+    parser.add_argument("--from", dest="first", required=True, help="first season, e.g. 2015-2016")
+    parser.add_argument("--to", dest="last", required=True, help="last season, e.g. 2024-2025")
+    parser.add_argument("--pages", default=",".join(PAGES), help="comma-separated subset of " + ",".join(PAGES))
+    parser.add_argument("--sink", choices=sorted(SINKS), default="sqlite")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-resume", action="store_true", help="refetch pages that were already ingested")
+    args = parser.parse_args()
+    
+    summary = ingest(
+        schools=args.schools.split(","),
+        seasons=season_range(args.first, args.last),
+        sport=args.sport,
+        pages=args.pages.split(","),
+        sink=SINKS[args.sink](),
+        max_workers=args.workers,
+        resume=not args.no_resume,
+    )
+    raise SystemExit(1 if summary['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
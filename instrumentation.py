@@ -0,0 +1,176 @@
+"""
+Process-wide timings, cache counters and gauges.
+
+Code wraps the work it wants measured in span("fetch") (or decorates it
+with @timed("aggregates")), reports cache lookups with cache_result(), and
+registers gauges as callbacks that are read when metrics are exported.
+api.py serves everything in Prometheus text format at /metrics, and the
+dashboard shows the same numbers in its debug panel.
+
+Spans only keep a count, a total and a maximum per (name, labels), so
+recording one costs a lock and a few additions. Set EDISON_METRICS=0 to
+turn spans and counters into no-ops.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import config
+
+PREFIX = "edison"
+
+_lock = threading.Lock()
+# (span name, sorted label items) -> [count, total seconds, max seconds]
+_spans = {}
+# (cache name, result) -> count
+_cache_results = {}
+# gauge name -> (help text, callback returning a number or None)
+_gauges = {}
+
+
+def _key(name, labels):
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def observe(name, seconds, **labels):
+    """
+    Records one span of the given duration
+    """
+    if not config.METRICS_ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        stats = _spans.get(key)
+        if stats is None:
+            _spans[key] = [1, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+
+@contextmanager
+def span(name, **labels):
+    """
+    Times the block as one span of name (e.g. "fetch", "parse", "figure")
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def timed(name, **labels):
+    """
+    Decorator form of span()
+    """
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def cache_result(cache, result):
+    """
+    Counts one lookup in cache; result is "hit", "miss" or e.g. "revalidated"
+    """
+    if not config.METRICS_ENABLED:
+        return
+    key = (cache, result)
+    with _lock:
+        _cache_results[key] = _cache_results.get(key, 0) + 1
+
+
+def gauge(name, callback, help=""):
+    """
+    Registers callback() as the value of gauge name, read on every export
+    """
+    _gauges[name] = (help, callback)
+
+
+def _gauge_values():
+    values = {}
+    for name, (help, callback) in list(_gauges.items()):
+        try:
+            value = callback()
+        except Exception:
+            value = None
+        if value is not None:
+            values[name] = (help, float(value))
+    return values
+
+
+def summary():
+    """
+    Plain-data copy of everything recorded, for the dashboard debug panel
+    """
+    with _lock:
+        spans = [
+            {'span': name, 'labels': ", ".join(f"{key}={value}" for key, value in labels),
+             'count': count, 'total_ms': total * 1000,
+             'mean_ms': total / count * 1000, 'max_ms': longest * 1000}
+            for (name, labels), (count, total, longest) in _spans.items()
+        ]
+        caches = {}
+        for (cache, result), count in _cache_results.items():
+            caches.setdefault(cache, {})[result] = count
+    return {
+        'spans': sorted(spans, key=lambda row: row['total_ms'], reverse=True),
+        'caches': caches,
+        'gauges': {name: value for name, (_, value) in _gauge_values().items()},
+    }
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(items):
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+def render_prometheus():
+    """
+    Everything recorded, in the Prometheus text exposition format
+    """
+    with _lock:
+        spans = {key: list(stats) for key, stats in _spans.items()}
+        cache_results = dict(_cache_results)
+
+    lines = [
+        f"# HELP {PREFIX}_span_seconds Time spent in instrumented spans",
+        f"# TYPE {PREFIX}_span_seconds summary",
+    ]
+    for (name, labels), (count, total, _) in sorted(spans.items()):
+        series = _labels((('span', name),) + labels)
+        lines.append(f"{PREFIX}_span_seconds_count{series} {count}")
+        lines.append(f"{PREFIX}_span_seconds_sum{series} {total:.6f}")
+
+    lines += [
+        f"# HELP {PREFIX}_span_max_seconds Longest single span since start",
+        f"# TYPE {PREFIX}_span_max_seconds gauge",
+    ]
+    for (name, labels), (_, _, longest) in sorted(spans.items()):
+        lines.append(f"{PREFIX}_span_max_seconds{_labels((('span', name),) + labels)} {longest:.6f}")
+
+    lines += [
+        f"# HELP {PREFIX}_cache_requests_total Cache lookups by cache and result",
+        f"# TYPE {PREFIX}_cache_requests_total counter",
+    ]
+    for (cache, result), count in sorted(cache_results.items()):
+        lines.append(f"{PREFIX}_cache_requests_total{_labels((('cache', cache), ('result', result)))} {count}")
+
+    for name, (help, value) in sorted(_gauge_values().items()):
+        lines += [
+            f"# HELP {PREFIX}_{name} {help}",
+            f"# TYPE {PREFIX}_{name} gauge",
+            f"{PREFIX}_{name} {value:g}",
+        ]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,94 @@
+"""
+Derived columns and distributions the dashboard shows next to the raw
+tables, computed once per data snapshot with vectorised pandas/numpy
+instead of row-wise loops. Season totals live in aggregates.py.
+"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import cache_result, timed
+
+
+def saves_per_game(goalies):
+    """
+    Saves / Games Played rounded to 2 places, 0 for keepers with no games
+    """
+    saves = goalies['Saves'].to_numpy(dtype=float)
+    games = goalies['Games Played'].to_numpy(dtype=float)
+    ratio = np.divide(saves, games, out=np.zeros_like(saves), where=games > 0)
+    return pd.Series(ratio, index=goalies.index, name='Saves Per Game').round(2)
+
+
+def position_counts(positions):
+    """
+    Players per position; a player listed as "F, M" counts once for each
+    """
+    # Only the distinct position strings ("M", "F, M", ...) need splitting
+    distinct = positions.astype(str).value_counts(sort=False)
+    parts = distinct.index.to_series().str.split(',').explode().str.strip()
+    return pd.Series(distinct.loc[parts.index].to_numpy()).groupby(parts.to_numpy(), sort=False).sum()
+
+
+def outcome_counts(outcomes):
+    """
+    Games per outcome ('W', 'L', 'T', '—' for unplayed), most common first
+    """
+    counts = outcomes.value_counts()
+    # Categorical columns also count outcomes that never happened
+    return counts[counts > 0]
+
+
+def top_performers(field, n=3):
+    return field.nlargest(n, 'Goals')[['Player', 'Goals', 'Assists']].to_dict(orient='records')
+
+
+@dataclass(frozen=True)
+class SnapshotMetrics:
+    version: int
+    # current goalies with a 'Saves Per Game' column
+    goalies: pd.DataFrame
+    # position -> number of roster players
+    positions: pd.Series
+    # outcome -> number of games
+    outcomes: pd.Series
+
+
+@timed('metrics')
+def build_metrics(snapshot):
+    data = snapshot.data
+    goalies = (data.get('current_stats') or {}).get('goalies', pd.DataFrame())
+    games = (data.get('fixtures') or {}).get('games', pd.DataFrame())
+    roster = data.get('roster')
+
+    if not goalies.empty:
+        goalies = goalies.assign(**{'Saves Per Game': saves_per_game(goalies)})
+
+    return SnapshotMetrics(
+        version=snapshot.version,
+        goalies=goalies,
+        positions=position_counts(roster['Position']) if roster is not None and 'Position' in roster else pd.Series(dtype=int),
+        outcomes=outcome_counts(games['Outcome']) if 'Outcome' in games else pd.Series(dtype=int),
+    )
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics(snapshot):
+    """
+    Returns the metrics for snapshot, computing them only when the version changes
+    """
+    global _metrics
+    metrics = _metrics
+    if metrics is not None and metrics.version == snapshot.version:
+        cache_result('metrics', 'hit')
+        return metrics
+    with _metrics_lock:
+        if _metrics is None or _metrics.version != snapshot.version:
+            cache_result('metrics', 'miss')
+            _metrics = build_metrics(snapshot)
+        return _metrics
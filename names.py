@@ -0,0 +1,198 @@
+"""
+Fuzzy name resolution for players and opponents.
+
+Free text from users and the LLM ("chris lopes", "Lopez", "Topher Lopez",
+"@ Piscataway\n") is resolved against the names in a snapshot in four
+steps: exact normalised match, nickname expansion, partial match on whole
+name tokens, and finally trigram similarity for misspellings. A query that
+fits several names about equally well ("Martinez" with five Martinezes on
+the team) resolves to none of them; ambiguous() lists the choices instead.
+"""
+import re
+import unicodedata
+
+# Nickname -> formal first names it can stand for (and the reverse is derived)
+NICKNAMES = {
+    'alex': ['alexander', 'alejandro', 'alexis'],
+    'andy': ['andrew', 'andres'],
+    'ben': ['benjamin'],
+    'chris': ['christopher', 'christian'],
+    'topher': ['christopher'],
+    'dan': ['daniel'],
+    'danny': ['daniel'],
+    'dave': ['david'],
+    'drew': ['andrew'],
+    'gabe': ['gabriel'],
+    'jake': ['jacob'],
+    'joe': ['joseph'],
+    'joey': ['joseph'],
+    'jon': ['jonathan'],
+    'josh': ['joshua'],
+    'matt': ['matthew', 'mateo'],
+    'max': ['maximilian', 'maxwell'],
+    'mike': ['michael'],
+    'nate': ['nathan', 'nathaniel'],
+    'nick': ['nicholas', 'nikhil'],
+    'rob': ['robert'],
+    'sam': ['samuel'],
+    'steve': ['steven', 'stephen'],
+    'tom': ['thomas'],
+    'tony': ['anthony'],
+    'will': ['william'],
+    'zach': ['zachary'],
+}
+
+_ALIASES = {}
+for _nick, _formal_names in NICKNAMES.items():
+    _ALIASES.setdefault(_nick, set()).update(_formal_names)
+    for _formal in _formal_names:
+        _ALIASES.setdefault(_formal, set()).add(_nick)
+# Nicknames of the same formal name stand for each other too (topher -> chris)
+for _nick, _formal_names in NICKNAMES.items():
+    for _formal in _formal_names:
+        _ALIASES[_nick].update(_ALIASES[_formal] - {_nick})
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize(text):
+    """
+    Lowercase, accent-free, punctuation-free, single-spaced form of a name.
+    Also drops the "vs "/"@ " prefixes nj.com puts on opponents.
+    """
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = " ".join(text.split())
+    for prefix in ("vs ", "vs. ", "@ "):
+        if text.startswith(prefix):
+            text = text[len(prefix):]
+    return " ".join(_PUNCTUATION.sub(" ", text).split())
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Resolves free text to one of a fixed set of names. Build once per
+    snapshot; every lookup is a few dict/set operations.
+
+    A fuzzy match only counts when it beats the runner-up by at least
+    margin, so a near tie is reported as ambiguous rather than guessed.
+    """
+
+    def __init__(self, names, min_score=0.45, margin=0.1):
+        self.min_score = min_score
+        self.margin = margin
+        self.names = []
+        self.exact = {}
+        self.tokens = {}
+        self.grams = {}
+        self._grams_of = []
+        for name in names:
+            key = normalize(name)
+            if not key or key in self.exact:
+                continue
+            i = len(self.names)
+            self.names.append(name)
+            self.exact[key] = i
+            for token in key.split():
+                self.tokens.setdefault(token, set()).add(i)
+            grams = trigrams(key)
+            self._grams_of.append(grams)
+            for gram in grams:
+                self.grams.setdefault(gram, set()).add(i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _variants(self, key):
+        # The query itself plus every nickname <-> formal swap of its first name
+        tokens = key.split()
+        yield key
+        for alias in sorted(_ALIASES.get(tokens[0], ())):
+            yield " ".join([alias] + tokens[1:])
+
+    def candidates(self, query, limit=5):
+        """
+        Best matches as [(name, score)], score 1.0 for exact matches. A
+        partial name shared by several players returns all of them (up to
+        limit) with the same score.
+        """
+        key = normalize(query)
+        if not key:
+            return []
+
+        for variant in self._variants(key):
+            if variant in self.exact:
+                return [(self.names[self.exact[variant]], 1.0 if variant == key else 0.95)]
+
+        # Partial names: every query token is a whole token of the name
+        partial = set()
+        for variant in self._variants(key):
+            matches = None
+            for token in variant.split():
+                ids = self.tokens.get(token, set())
+                matches = ids if matches is None else matches & ids
+            partial |= matches or set()
+        if partial:
+            return [(self.names[i], 0.9) for i in sorted(partial)][:limit]
+
+        # Misspellings: Dice coefficient over character trigrams
+        query_grams = trigrams(key)
+        shared = {}
+        for gram in query_grams:
+            for i in self.grams.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+        scored = [
+            (self.names[i], 2 * count / (len(query_grams) + len(self._grams_of[i])))
+            for i, count in shared.items()
+        ]
+        scored = [item for item in scored if item[1] >= self.min_score]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def best(self, query):
+        """
+        (name, score) of the one clear best match for query, or None when
+        nothing matches or several names match about equally well
+        """
+        matches = self.candidates(query, limit=2)
+        if not matches:
+            return None
+        if len(matches) > 1 and matches[0][1] - matches[1][1] < self.margin:
+            return None
+        return matches[0]
+
+    def resolve(self, query):
+        """
+        The name query clearly refers to, or None
+        """
+        best = self.best(query)
+        return best[0] if best else None
+
+    def ambiguous(self, query, limit=5):
+        """
+        The names query could equally refer to, or [] when it resolves to one
+        name or to none
+        """
+        matches = self.candidates(query, limit=limit)
+        if len(matches) < 2 or matches[0][1] - matches[1][1] >= self.margin:
+            return []
+        return [name for name, score in matches if matches[0][1] - score < self.margin]
+
+
+def link_names(source, target, min_score=0.8):
+    """
+    Maps each name in source to the same person in target ({source: target}),
+    e.g. this season's stats to last season's or to the roster
+    """
+    index = target if isinstance(target, NameIndex) else NameIndex(target)
+    links = {}
+    for name in source:
+        best = index.best(name)
+        if best and best[1] >= min_score:
+            links[name] = best[0]
+    return links
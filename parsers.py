@@ -0,0 +1,57 @@
+from bs4 import BeautifulSoup, SoupStrainer
+
+import config
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Name -> (BeautifulSoup tree builder, only build the tables we read)
+BACKENDS = {
+    'html.parser': ('html.parser', False),
+    'html.parser+strainer': ('html.parser', True),
+    'lxml': ('lxml', False),
+    'lxml+strainer': ('lxml', True),
+}
+
+
+def _has_class(name):
+    # While parsing, strainers see the raw class string ("table table-stats"),
+    # not the split list find_all matches against
+    def match(value):
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return name in classes
+    return match
+
+
+# The parts of each page the scrapers actually look at
+STATS_TABLES = SoupStrainer('table', class_=_has_class('table-stats'))
+SCHEDULE_TABLE = SoupStrainer('table', class_=_has_class('table'))
+ROSTER_ROWS = SoupStrainer('tr')
+
+
+def default_backend():
+    if config.PARSER_BACKEND:
+        return config.PARSER_BACKEND
+    return 'lxml+strainer' if HAS_LXML else 'html.parser+strainer'
+
+
+def make_soup(html, only=None, backend=None):
+    """
+    Parses html with the selected backend. With a strainer backend only the
+    elements matched by `only` are turned into a tree, which skips the nav,
+    ads and scripts that make up most of an nj.com page.
+    """
+    backend = backend or default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}, expected one of {sorted(BACKENDS)}")
+    
+    features, restrict = BACKENDS[backend]
+    if features == 'lxml' and not HAS_LXML:
+        features = 'html.parser'
+    
+    return BeautifulSoup(html, features, parse_only=only if restrict else None)
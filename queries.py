@@ -0,0 +1,45 @@
+"""
+Read-only questions about a data snapshot, shared by the API and the agent.
+Each returns plain JSON-serialisable data, or None when nothing matches.
+Names are resolved fuzzily, so misspellings, nicknames and partial names work.
+A name that fits several players or opponents equally well raises
+AmbiguousName with the choices instead of guessing one.
+"""
+from indexes import get_index, normalize_name
+
+
+class AmbiguousName(LookupError):
+    def __init__(self, query, choices):
+        super().__init__(f"'{query}' could be any of: {', '.join(choices)}")
+        self.query = query
+        self.choices = choices
+
+
+def _resolve(names, query):
+    match = names.resolve(query)
+    if match is None:
+        choices = names.ambiguous(query)
+        if choices:
+            raise AmbiguousName(query, choices)
+    return match
+
+
+def player_stats(snapshot, name):
+    index = get_index(snapshot)
+    match = _resolve(index.player_names, name)
+    return index.players[normalize_name(match)] if match else None
+
+
+def top_scorers(snapshot, limit=5):
+    return get_index(snapshot).top_scorers[:max(0, limit)]
+
+
+def opponent_info(snapshot, team_name):
+    index = get_index(snapshot)
+    match = _resolve(index.opponent_names, team_name)
+    return index.opponents[normalize_name(match)] if match else None
+
+
+def team_summary(snapshot):
+    # Precomputed with the snapshot, see aggregates.build_aggregates
+    return snapshot.aggregates or None
@@ -0,0 +1,96 @@
+import threading
+from datetime import date
+
+import config
+from data_store import get_store
+
+
+def is_game_day(snapshot, today=None):
+    """
+    True if the snapshot's schedule has a game on `today`
+    """
+    if snapshot is None or not snapshot.data.get('fixtures'):
+        return False
+    games = snapshot.data['fixtures']['games']
+    if games.empty or 'Date' not in games.columns:
+        return False
+    
+    today = today or date.today()
+    return bool((games['Date'].dt.date == today).any())
+
+
+class RefreshScheduler:
+    """
+    Re-scrapes on a fixed cadence in a daemon thread so readers always find a
+    warm snapshot. Refreshes run every `game_day_interval` seconds on days with
+    a game on the schedule and every `interval` seconds otherwise.
+    """
+
+    def __init__(self, store, interval=None, game_day_interval=None):
+        self.store = store
+        self.interval = config.REFRESH_INTERVAL if interval is None else interval
+        self.game_day_interval = config.REFRESH_INTERVAL_GAME_DAY if game_day_interval is None else game_day_interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def next_delay(self):
+        if is_game_day(self.store.snapshot):
+            return self.game_day_interval
+        return self.interval
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        # Refresh right away unless a fresh snapshot is already loaded
+        snapshot = self.store.load_persisted()
+        if snapshot is not None and snapshot.age < self.next_delay():
+            delay = self.next_delay() - snapshot.age
+        else:
+            delay = 0
+        
+        while not self._stop.wait(delay):
+            try:
+                self.store.refresh()
+            except Exception as e:
+                print(f"❌ Scheduled refresh failed: {e}")
+            # Without any data yet, try again soon rather than at the usual cadence
+            delay = self.next_delay() if self.store.snapshot is not None else self.store.retry_delay
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler():
+    """
+    Starts the process-wide scheduler for the shared store (once per process)
+    """
+    global _scheduler
+    if not config.SCHEDULER_ENABLED:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RefreshScheduler(get_store())
+        _scheduler.start()
+        return _scheduler
+
+
+def refresh_cadence(snapshot=None):
+    """
+    Seconds between refreshes that apply to snapshot right now; used to tell
+    HTTP clients how long a response stays current
+    """
+    snapshot = snapshot or get_store().snapshot
+    if _scheduler is None:
+        return config.DATA_TTL
+    if is_game_day(snapshot):
+        return _scheduler.game_day_interval
+    return _scheduler.interval
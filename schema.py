@@ -0,0 +1,115 @@
+"""
+Column types for the scraped tables.
+
+The parsers hand their rows to typed_frame(), which builds the DataFrame
+with compact dtypes: categoricals for the few distinct values of class
+year, position, location and outcome, small ints for counts, real dates
+for game days, and the score split out of the result text. Frames read
+back from the stats store go through apply_schema() to get the same types.
+"""
+import re
+
+import pandas as pd
+
+from seasons import CURRENT_SEASON, parse_game_date
+
+# Bump when the parsed table layout changes, so cached parses are redone
+VERSION = 2
+
+OUTCOME = pd.CategoricalDtype(['W', 'L', 'T', '—'])
+LOCATION = pd.CategoricalDtype(['Home', 'Away'])
+
+# Table name -> column -> dtype; columns without a dtype keep what pandas infers
+SCHEMAS = {
+    'field_players': {
+        'Player': None,
+        'Year': 'category',
+        'Position': 'category',
+        'Goals': 'int16',
+        'Assists': 'int16',
+        'Points': 'int16',
+    },
+    'goalies': {
+        'Player': None,
+        'Year': 'category',
+        'Position': 'category',
+        'Saves': 'int16',
+        'Games Played': 'int16',
+    },
+    'games': {
+        'Date': 'datetime64[ns]',
+        'Opponent': None,
+        'Location': LOCATION,
+        'Result': None,
+        'Outcome': OUTCOME,
+        'Goals For': 'Int8',
+        'Goals Against': 'Int8',
+        'Record': None,
+    },
+    'roster': {
+        'Number': None,
+        'Name': None,
+        'Position': 'category',
+        'Year': 'category',
+    },
+}
+
+CLASS_YEARS = {'Fr.', 'So.', 'Jr.', 'Sr.', 'Fr', 'So', 'Jr', 'Sr'}
+
+_SCORE = re.compile(r"(\d+)\s*-\s*(\d+)")
+
+
+def split_year_position(text):
+    """
+    "Jr. • M, D" -> ("Jr.", "M, D"); either part is None when missing
+    """
+    parts = [part.strip() for part in str(text or "").split("•")]
+    if len(parts) >= 2:
+        return parts[0] or None, parts[1] or None
+    if not parts[0]:
+        return None, None
+    return (parts[0], None) if parts[0] in CLASS_YEARS else (None, parts[0])
+
+
+def split_score(result, outcome):
+    """
+    Goals for and against from a result such as "W\\n4-1", or (None, None)
+    for games not played yet. The outcome decides which side is ours, so it
+    works whether the page lists our score or the winner's first.
+    """
+    match = _SCORE.search(str(result or ""))
+    if not match:
+        return None, None
+    high, low = sorted((int(match.group(1)), int(match.group(2))), reverse=True)
+    if outcome == 'L':
+        return low, high
+    if outcome in ('W', 'T'):
+        return high, low
+    return int(match.group(1)), int(match.group(2))
+
+
+def game_date(text, season=CURRENT_SEASON):
+    parsed = parse_game_date(text, season)
+    return pd.Timestamp(parsed) if parsed else None
+
+
+def apply_schema(df, table):
+    """
+    Casts df's columns to the table's dtypes, leaving unknown columns alone
+    """
+    for column, dtype in SCHEMAS[table].items():
+        if dtype is None or column not in df.columns or df[column].dtype == dtype:
+            continue
+        if dtype == 'datetime64[ns]':
+            df[column] = pd.to_datetime(df[column], errors='coerce', format='ISO8601').astype(dtype)
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def typed_frame(rows, table):
+    """
+    DataFrame of parsed rows (dicts) with the table's columns and dtypes,
+    including when there are no rows
+    """
+    return apply_schema(pd.DataFrame(rows, columns=list(SCHEMAS[table])), table)
@@ -1,241 +1,406 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 from datetime import datetime
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-def scrape_edison_soccer_stats(year="2025-2026"):
+import config
+import http_client
+import schema
+from http_cache import get_cache
+from instrumentation import cache_result, span
+from parsers import ROSTER_ROWS, SCHEDULE_TABLE, STATS_TABLES, make_soup
+from seasons import CURRENT_SEASON, PREVIOUS_SEASON, is_historical_season
+
+def season_url(year, page="", school=None, sport=None):
     """
-    Scrapes Edison High School soccer stats from nj.com
+    URL of a season page on nj.com; page is "", "stats" or "roster"
+    """
+    url = f"{config.BASE_URL}/school/{school or config.SCHOOL}/{sport or config.SPORT}/season/{year}"
+    return f"{url}/{page}" if page else url
+
+def _fetch_entry(url, parse=None, timeout=None, cache_forever=False, revalidate=False):
     """
-    url = f"https://highschoolsports.nj.com/school/edison-edison/boyssoccer/season/{year}/stats"
+    Fetches url through the on-disk response cache and returns its cache entry.
+    With parse given, the entry's 'parsed' is parse(html), computed only when
+    the cached one is missing, out of date or for a changed body.
+    """
+    cache = get_cache()
+    entry = cache.get(url) if cache else None
+    
+    if entry is not None and parse is not None and (entry.get('parsed') is None or entry.get('schema') != schema.VERSION):
+        # Not parsed yet, or parsed with an older table layout; parse the stored body
+        entry['parsed'] = parse(entry['body'])
+        entry['schema'] = schema.VERSION
+        cache.put(url, entry)
+    
+    if entry is not None and cache.is_fresh(entry) and (not revalidate or entry.get('forever')):
+        cache_result('http', 'hit')
+        return entry
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+    headers = {}
+    if entry is not None:
+        # Revalidate the stale copy instead of downloading it again
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    
+    response = http_client.get(url, headers=headers, timeout=timeout)
+    
+    if response.status_code == 304 and entry is not None:
+        cache_result('http', 'revalidated')
+        entry['stored_at'] = time.time()
+        cache.put(url, entry)
+        return entry
+    
+    response.raise_for_status()
+    body_hash = hashlib.sha1(response.content).hexdigest()
+    
+    if entry is not None and entry.get('body_hash') == body_hash:
+        # Server ignored the validators but the page is byte-for-byte the same
+        cache_result('http', 'unchanged')
+        parsed = entry.get('parsed')
+    else:
+        if cache:
+            cache_result('http', 'miss')
+        parsed = parse(response.text) if parse is not None else None
+    
+    entry = {
+        'url': url,
+        'body': response.text,
+        'body_hash': body_hash,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'stored_at': time.time(),
+        'forever': cache_forever,
+        'schema': schema.VERSION,
+        'parsed': parsed
     }
+    if cache:
+        cache.put(url, entry)
+    return entry
+
+def fetch_parsed(url, parse, timeout=None, cache_forever=False, revalidate=False):
+    """
+    Fetches url and returns parse(html), going through the on-disk response cache.
+    A fresh cache hit or a 304 Not Modified reuses the stored parse result, so
+    neither the download nor the BeautifulSoup parse is repeated. A full
+    response whose body hash matches the cached body also skips the parse.
+    revalidate=True asks the server even if the cached copy is still fresh
+    (pages of finished seasons are never revalidated).
+    """
+    return _fetch_entry(url, parse, timeout=timeout, cache_forever=cache_forever, revalidate=revalidate)['parsed']
+
+def fetch_html(url, timeout=None, cache_forever=False, revalidate=False):
+    """
+    Like fetch_parsed, but returns the page's HTML for callers that parse it
+    themselves (e.g. the row generators below)
+    """
+    return _fetch_entry(url, timeout=timeout, cache_forever=cache_forever, revalidate=revalidate)['body']
+
+def iter_stats_rows(html, backend=None):
+    """
+    Yields ('field_players' or 'goalies', record) for each player on a season
+    stats page as the rows are parsed
+    """
+    soup = make_soup(html, STATS_TABLES, backend)
+    
+    # Find all stat tables
+    tables = soup.find_all('table', class_='table-stats')
+    
+    # Parse field player stats (first table)
+    if len(tables) > 0:
+        rows = tables[0].find('tbody').find_all('tr')
+        for row in rows:
+            if 'table-secondary' in row.get('class', []):  # Skip total row
+                continue
+                
+            cols = row.find_all('td')
+            if len(cols) >= 4:
+                player_link = cols[0].find('a')
+                player_name = player_link.text.strip() if player_link else "Unknown"
+                
+                player_info = cols[0].find('small', class_='text-muted')
+                class_year, position = schema.split_year_position(player_info.text if player_info else "")
+                
+                goals = cols[1].text.strip()
+                goals = 0 if goals == "—" else int(goals)
+                
+                assists = cols[2].text.strip()
+                assists = 0 if assists == "—" else int(assists)
+                
+                points = cols[3].text.strip()
+                points = 0 if points == "—" else int(points)
+                
+                yield 'field_players', {
+                    'Player': player_name,
+                    'Year': class_year,
+                    'Position': position,
+                    'Goals': goals,
+                    'Assists': assists,
+                    'Points': points
+                }
+    
+    # Parse goalkeeper stats (second table)
+    if len(tables) > 1:
+        rows = tables[1].find('tbody').find_all('tr')
+        for row in rows:
+            if 'table-secondary' in row.get('class', []):
+                continue
+                
+            cols = row.find_all('td')
+            if len(cols) >= 3:
+                player_link = cols[0].find('a')
+                player_name = player_link.text.strip() if player_link else "Unknown"
+                
+                player_info = cols[0].find('small', class_='text-muted')
+                class_year, position = schema.split_year_position(player_info.text if player_info else "")
+                
+                saves = cols[1].text.strip()
+                saves = 0 if saves == "—" else int(saves)
+                
+                games = cols[2].text.strip()
+                games = 0 if games == "—" else int(games)
+                
+                yield 'goalies', {
+                    'Player': player_name,
+                    'Year': class_year,
+                    'Position': position,
+                    'Saves': saves,
+                    'Games Played': games
+                }
+
+def parse_stats_page(html, backend=None):
+    """
+    Parses the field player and goalkeeper tables of a season stats page
+    """
+    rows = {'field_players': [], 'goalies': []}
+    with span('parse', page='stats'):
+        for table, record in iter_stats_rows(html, backend):
+            rows[table].append(record)
+    with span('build', page='stats'):
+        return {table: schema.typed_frame(records, table) for table, records in rows.items()}
+
+def scrape_edison_soccer_stats(year="2025-2026", timeout=None, revalidate=False, school=None, sport=None):
+    """
+    Scrapes Edison High School soccer stats from nj.com
+    """
+    url = season_url(year, "stats", school=school, sport=sport)
     
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        stats = fetch_parsed(url, parse_stats_page, timeout=timeout, cache_forever=is_historical_season(year), revalidate=revalidate)
         
-        # Find all stat tables
-        tables = soup.find_all('table', class_='table-stats')
+        print(f"✅ Scraped {len(stats['field_players'])} field players from {year}")
+        print(f"✅ Scraped {len(stats['goalies'])} goalkeepers from {year}")
         
-        # Parse field player stats (first table)
-        field_players = []
-        if len(tables) > 0:
-            rows = tables[0].find('tbody').find_all('tr')
-            for row in rows:
-                if 'table-secondary' in row.get('class', []):  # Skip total row
-                    continue
-                    
-                cols = row.find_all('td')
-                if len(cols) >= 4:
-                    player_link = cols[0].find('a')
-                    player_name = player_link.text.strip() if player_link else "Unknown"
-                    
-                    player_info = cols[0].find('small', class_='text-muted')
-                    year_position = player_info.text.strip() if player_info else ""
-                    
-                    goals = cols[1].text.strip()
-                    goals = 0 if goals == "—" else int(goals)
-                    
-                    assists = cols[2].text.strip()
-                    assists = 0 if assists == "—" else int(assists)
-                    
-                    points = cols[3].text.strip()
-                    points = 0 if points == "—" else int(points)
-                    
-                    field_players.append({
-                        'Player': player_name,
-                        'Year/Position': year_position,
-                        'Goals': goals,
-                        'Assists': assists,
-                        'Points': points
-                    })
-        
-        # Parse goalkeeper stats (second table)
-        goalies = []
-        if len(tables) > 1:
-            rows = tables[1].find('tbody').find_all('tr')
-            for row in rows:
-                if 'table-secondary' in row.get('class', []):
-                    continue
-                    
-                cols = row.find_all('td')
-                if len(cols) >= 3:
-                    player_link = cols[0].find('a')
-                    player_name = player_link.text.strip() if player_link else "Unknown"
-                    
-                    player_info = cols[0].find('small', class_='text-muted')
-                    year_position = player_info.text.strip() if player_info else ""
-                    
-                    saves = cols[1].text.strip()
-                    saves = 0 if saves == "—" else int(saves)
-                    
-                    games = cols[2].text.strip()
-                    games = 0 if games == "—" else int(games)
-                    
-                    goalies.append({
-                        'Player': player_name,
-                        'Year/Position': year_position,
-                        'Saves': saves,
-                        'Games Played': games
-                    })
-        
-        field_df = pd.DataFrame(field_players)
-        goalie_df = pd.DataFrame(goalies)
-        
-        print(f"✅ Scraped {len(field_players)} field players from {year}")
-        print(f"✅ Scraped {len(goalies)} goalkeepers from {year}")
-        
-        return {
-            'field_players': field_df,
-            'goalies': goalie_df
-        }
+        return stats
         
     except Exception as e:
         print(f"❌ Error scraping stats for {year}: {e}")
         return None
 
-def scrape_fixtures(year="2025-2026"):
+def iter_schedule_rows(html, backend=None, season=CURRENT_SEASON):
     """
-    Scrapes schedule/fixtures
+    Yields ('games', record) for each game in the schedule/results table of a
+    season page; season supplies the year that the page's dates leave out
     """
-    url = f"https://highschoolsports.nj.com/school/edison-edison/boyssoccer/season/{year}"
+    soup = make_soup(html, SCHEDULE_TABLE, backend)
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-    }
+    # Find schedule table
+    schedule_table = soup.find('table', class_='table')
     
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Hardcode coach for now (can update to scrape later)
-        coach_name = "Steve Rubin"
-        
-        # Find schedule table
-        games = []
-        schedule_table = soup.find('table', class_='table')
+    if schedule_table:
+        rows = schedule_table.find('tbody').find_all('tr') if schedule_table.find('tbody') else schedule_table.find_all('tr')
         
-        if schedule_table:
-            rows = schedule_table.find('tbody').find_all('tr') if schedule_table.find('tbody') else schedule_table.find_all('tr')
-            
-            for row in rows:
-                cols = row.find_all('td')
-                if len(cols) >= 3:
-                    try:
-                        date = cols[0].text.strip()
-                        opponent = cols[1].text.strip()
-                        result = cols[2].text.strip() if len(cols) > 2 else "—"
-                        record = cols[3].text.strip() if len(cols) > 3 else "—"
-                        
-                        # Determine if home or away
-                        location = "Home" if "vs" in opponent else "Away"
-                        # Clean opponent name
-                        opponent = opponent.replace("vs ", "").replace("@ ", "").strip()
-                        
-                        # Parse result
-                        if result and result != "—":
-                            if result.startswith("W"):
-                                outcome = "W"
-                            elif result.startswith("L"):
-                                outcome = "L"
-                            elif result.startswith("T"):
-                                outcome = "T"
-                            else:
-                                outcome = "—"
+        for row in rows:
+            cols = row.find_all('td')
+            if len(cols) >= 3:
+                try:
+                    date = cols[0].text.strip()
+                    opponent = cols[1].text.strip()
+                    result = cols[2].text.strip() if len(cols) > 2 else "—"
+                    record = cols[3].text.strip() if len(cols) > 3 else "—"
+                    
+                    # Determine if home or away
+                    location = "Home" if "vs" in opponent else "Away"
+                    # Clean opponent name
+                    opponent = opponent.replace("vs ", "").replace("@ ", "").strip()
+                    
+                    # Parse result
+                    if result and result != "—":
+                        if result.startswith("W"):
+                            outcome = "W"
+                        elif result.startswith("L"):
+                            outcome = "L"
+                        elif result.startswith("T"):
+                            outcome = "T"
                         else:
                             outcome = "—"
-                        
-                        games.append({
-                            'Date': date,
-                            'Opponent': opponent,
-                            'Location': location,
-                            'Result': result,
-                            'Outcome': outcome,
-                            'Record': record
-                        })
-                    except Exception as e:
-                        continue
-        
-        print(f"✅ Scraped {len(games)} games from schedule")
-        print(f"✅ Head Coach: {coach_name}")
-        
+                    else:
+                        outcome = "—"
+                    
+                    goals_for, goals_against = schema.split_score(result, outcome)
+                    
+                    game = {
+                        'Date': schema.game_date(date, season),
+                        'Opponent': opponent,
+                        'Location': location,
+                        'Result': result,
+                        'Outcome': outcome,
+                        'Goals For': goals_for,
+                        'Goals Against': goals_against,
+                        'Record': record
+                    }
+                except Exception as e:
+                    continue
+                yield 'games', game
+
+def parse_schedule_page(html, backend=None, season=CURRENT_SEASON):
+    """
+    Parses the schedule/results table of a season page
+    """
+    # Hardcode coach for now (can update to scrape later)
+    coach_name = "Steve Rubin"
+    
+    with span('parse', page='schedule'):
+        games = [record for _, record in iter_schedule_rows(html, backend, season)]
+    with span('build', page='schedule'):
         return {
             'coach': coach_name,
-            'games': pd.DataFrame(games)
+            'games': schema.typed_frame(games, 'games')
         }
+
+def scrape_fixtures(year="2025-2026", timeout=None, revalidate=False, school=None, sport=None):
+    """
+    Scrapes schedule/fixtures
+    """
+    url = season_url(year, school=school, sport=sport)
+    
+    try:
+        fixtures = fetch_parsed(url, partial(parse_schedule_page, season=year), timeout=timeout, cache_forever=is_historical_season(year), revalidate=revalidate)
+        
+        print(f"✅ Scraped {len(fixtures['games'])} games from schedule")
+        print(f"✅ Head Coach: {fixtures['coach']}")
+        
+        return fixtures
         
     except Exception as e:
         print(f"❌ Error scraping fixtures: {e}")
-        return {'coach': 'Steve Rubin', 'games': pd.DataFrame()}
+        return {'coach': 'Steve Rubin', 'games': schema.typed_frame([], 'games')}
 
-def scrape_roster(year="2025-2026"):
+def iter_roster_rows(html, backend=None):
     """
-    Scrapes team roster
+    Yields ('roster', record) for each player on a season roster page
     """
-    url = f"https://highschoolsports.nj.com/school/edison-edison/boyssoccer/season/{year}/roster"
+    soup = make_soup(html, ROSTER_ROWS, backend)
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-    }
+    roster_rows = soup.find_all('tr')
+    
+    for row in roster_rows:
+        cols = row.find_all('td')
+        if len(cols) >= 4:
+            try:
+                number = cols[0].text.strip()
+                name = cols[1].text.strip()
+                position = cols[2].text.strip()
+                year = cols[3].text.strip()
+                
+                player = {
+                    'Number': number,
+                    'Name': name,
+                    'Position': position,
+                    'Year': year
+                }
+            except:
+                continue
+            yield 'roster', player
+
+def parse_roster_page(html, backend=None):
+    """
+    Parses the roster table of a season roster page
+    """
+    with span('parse', page='roster'):
+        players = [record for _, record in iter_roster_rows(html, backend)]
+    with span('build', page='roster'):
+        return schema.typed_frame(players, 'roster')
+
+def scrape_roster(year="2025-2026", timeout=None, revalidate=False, school=None, sport=None):
+    """
+    Scrapes team roster
+    """
+    url = season_url(year, "roster", school=school, sport=sport)
     
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        players = []
-        roster_rows = soup.find_all('tr')
-        
-        for row in roster_rows:
-            cols = row.find_all('td')
-            if len(cols) >= 4:
-                try:
-                    number = cols[0].text.strip()
-                    name = cols[1].text.strip()
-                    position = cols[2].text.strip()
-                    year = cols[3].text.strip()
-                    
-                    players.append({
-                        'Number': number,
-                        'Name': name,
-                        'Position': position,
-                        'Year': year
-                    })
-                except:
-                    continue
+        roster = fetch_parsed(url, parse_roster_page, timeout=timeout, cache_forever=is_historical_season(year), revalidate=revalidate)
         
-        print(f"✅ Scraped {len(players)} players from roster")
+        print(f"✅ Scraped {len(roster)} players from roster")
         
-        return pd.DataFrame(players)
+        return roster
         
     except Exception as e:
         print(f"❌ Error scraping roster: {e}")
-        return pd.DataFrame()
+        return schema.typed_frame([], 'roster')
 
-def scrape_all_data():
+def iter_edison_soccer_stats(year="2025-2026", timeout=None, revalidate=False, school=None, sport=None):
+    """
+    Streaming variant of scrape_edison_soccer_stats: yields
+    ('field_players' or 'goalies', record) without building DataFrames.
+    Errors are raised rather than printed.
+    """
+    url = season_url(year, "stats", school=school, sport=sport)
+    html = fetch_html(url, timeout=timeout, cache_forever=is_historical_season(year), revalidate=revalidate)
+    yield from iter_stats_rows(html)
+
+def iter_fixtures(year="2025-2026", timeout=None, revalidate=False, school=None, sport=None):
+    """
+    Streaming variant of scrape_fixtures: yields ('games', record)
+    """
+    url = season_url(year, school=school, sport=sport)
+    html = fetch_html(url, timeout=timeout, cache_forever=is_historical_season(year), revalidate=revalidate)
+    yield from iter_schedule_rows(html, season=year)
+
+def iter_roster(year="2025-2026", timeout=None, revalidate=False, school=None, sport=None):
+    """
+    Streaming variant of scrape_roster: yields ('roster', record)
+    """
+    url = season_url(year, "roster", school=school, sport=sport)
+    html = fetch_html(url, timeout=timeout, cache_forever=is_historical_season(year), revalidate=revalidate)
+    yield from iter_roster_rows(html)
+
+def scrape_all_data(concurrent=True, max_workers=None, timeout=None, revalidate=False):
     """
     Scrapes all data: current stats, previous year stats, fixtures, roster
+
+    With concurrent=True all four pages are requested at once (at most
+    max_workers at a time), so the total time is close to the slowest page
+    instead of the sum of all of them. revalidate=True checks every cached
+    page with the server instead of trusting the cache TTL.
     """
     print("🔄 Starting full data scrape...")
     
-    # Current year
-    current_stats = scrape_edison_soccer_stats("2025-2026")
-    fixtures_data = scrape_fixtures("2025-2026")
-    roster = scrape_roster("2025-2026")
+    jobs = {
+        # Current year
+        'current_stats': (scrape_edison_soccer_stats, CURRENT_SEASON),
+        'fixtures': (scrape_fixtures, CURRENT_SEASON),
+        'roster': (scrape_roster, CURRENT_SEASON),
+        # Previous year for comparison
+        'previous_stats': (scrape_edison_soccer_stats, PREVIOUS_SEASON),
+    }
     
-    # Previous year for comparison
-    previous_stats = scrape_edison_soccer_stats("2024-2025")
+    if not concurrent:
+        results = {key: func(year, timeout=timeout, revalidate=revalidate) for key, (func, year) in jobs.items()}
+    else:
+        workers = max(1, min(max_workers or config.SCRAPE_MAX_WORKERS, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as pool:
+            futures = {key: pool.submit(func, year, timeout=timeout, revalidate=revalidate) for key, (func, year) in jobs.items()}
+            results = {key: future.result() for key, future in futures.items()}
     
     return {
-        'current_stats': current_stats,
-        'previous_stats': previous_stats,
-        'fixtures': fixtures_data,
-        'roster': roster
+        'current_stats': results['current_stats'],
+        'previous_stats': results['previous_stats'],
+        'fixtures': results['fixtures'],
+        'roster': results['roster']
     }
 
 if __name__ == "__main__":
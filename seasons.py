@@ -0,0 +1,61 @@
+from datetime import datetime
+
+# Season currently being played; everything before it is final
+CURRENT_SEASON = "2025-2026"
+PREVIOUS_SEASON = "2024-2025"
+
+
+def is_historical_season(year):
+    """
+    True for seasons that are over, e.g. "2024-2025" while CURRENT_SEASON is
+    "2025-2026". Their pages never change, so they can be cached forever.
+    """
+    return year < CURRENT_SEASON
+
+
+# Date formats seen in the schedule's Date column; the year is implied by the season
+_DATE_FORMATS = ("%b %d", "%a, %b %d", "%a %b %d", "%B %d", "%m/%d", "%a, %m/%d", "%a %m/%d")
+
+
+def season_years(year):
+    """
+    "2025-2026" -> (2025, 2026)
+    """
+    start, end = year.split("-")
+    return int(start), int(end)
+
+
+def parse_game_date(text, year=CURRENT_SEASON):
+    """
+    Parses a schedule date such as "Sep 4" or "Thu, 9/4" into a date. Fall
+    months belong to the first year of the season, spring months to the second.
+    Returns None for text that isn't a date (e.g. "TBD").
+    """
+    text = " ".join(str(text).replace(".", "").replace("Sept", "Sep").split())
+    if not text:
+        return None
+    
+    try:
+        return datetime.strptime(text, "%m/%d/%Y").date()
+    except ValueError:
+        pass
+    
+    start, end = season_years(year)
+    for fmt in _DATE_FORMATS:
+        try:
+            # 2000 is a leap year, so Feb 29 parses before the real year is applied
+            parsed = datetime.strptime(f"{text} 2000", f"{fmt} %Y").date()
+        except ValueError:
+            continue
+        return parsed.replace(year=start if parsed.month >= 7 else end)
+    return None
+
+
+def season_range(first, last):
+    """
+    All seasons from first to last inclusive, e.g.
+    season_range("2022-2023", "2024-2025") -> ["2022-2023", "2023-2024", "2024-2025"]
+    """
+    start, _ = season_years(first)
+    stop, _ = season_years(last)
+    return [f"{y}-{y + 1}" for y in range(start, stop + 1)]
@@ -0,0 +1,307 @@
+"""
+Local SQLite store for scraped tables.
+
+Rows are keyed by (school, sport, season, player/game) and upserted, so a
+refresh only writes rows whose values changed. Every change to a player's
+stat line is also appended to a *_history table for trend analysis.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import config
+from schema import apply_schema
+from seasons import CURRENT_SEASON, PREVIOUS_SEASON
+
+# Table name -> DataFrame column -> SQL column, key columns and the columns
+# whose changes are recorded in <table>_history
+TABLES = {
+    'field_players': {
+        'columns': {'Player': 'player', 'Year': 'year', 'Position': 'position', 'Goals': 'goals',
+                    'Assists': 'assists', 'Points': 'points'},
+        'key': ['player'],
+        'history': ['goals', 'assists', 'points'],
+    },
+    'goalies': {
+        'columns': {'Player': 'player', 'Year': 'year', 'Position': 'position', 'Saves': 'saves',
+                    'Games Played': 'games_played'},
+        'key': ['player'],
+        'history': ['saves', 'games_played'],
+    },
+    'games': {
+        'columns': {'Date': 'date', 'Opponent': 'opponent', 'Location': 'location', 'Result': 'result',
+                    'Outcome': 'outcome', 'Goals For': 'goals_for', 'Goals Against': 'goals_against',
+                    'Record': 'record'},
+        'key': ['date', 'opponent'],
+        'history': [],
+    },
+    'roster': {
+        'columns': {'Number': 'number', 'Name': 'name', 'Position': 'position', 'Year': 'year'},
+        'key': ['name'],
+        'history': [],
+    },
+}
+
+SCOPE = ['school', 'sport', 'season']
+
+
+def _sql_value(value):
+    # Dates as ISO text, so they sort and compare as dates; missing values as NULL
+    if pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.strftime('%Y-%m-%d')
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _schema():
+    statements = [
+        """CREATE TABLE IF NOT EXISTS datasets (
+            school TEXT, sport TEXT, season TEXT, coach TEXT, saved_at REAL,
+            PRIMARY KEY (school, sport, season))""",
+        """CREATE TABLE IF NOT EXISTS ingest_pages (
+            school TEXT, sport TEXT, season TEXT, page TEXT, ingested_at REAL,
+            PRIMARY KEY (school, sport, season, page))""",
+    ]
+    for table, spec in TABLES.items():
+        columns = list(spec['columns'].values())
+        key = SCOPE + spec['key']
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            f"{', '.join(f'{c}' for c in SCOPE + columns)}, row_order INTEGER, updated_at REAL, "
+            f"PRIMARY KEY ({', '.join(key)}))"
+        )
+        if spec['history']:
+            tracked = SCOPE + spec['key'] + spec['history']
+            statements.append(
+                f"CREATE TABLE IF NOT EXISTS {table}_history ("
+                f"{', '.join(tracked)}, recorded_at REAL)"
+            )
+            new_values = ', '.join(f'NEW.{c}' for c in tracked)
+            changed = ' OR '.join(f'OLD.{c} IS NOT NEW.{c}' for c in spec['history'])
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_history_insert AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {table}_history VALUES ({new_values}, NEW.updated_at); END"
+            )
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_history_update AFTER UPDATE ON {table} "
+                f"WHEN {changed} BEGIN "
+                f"INSERT INTO {table}_history VALUES ({new_values}, NEW.updated_at); END"
+            )
+    return statements
+
+
+class StatsStore:
+    def __init__(self, path=None):
+        self.path = path or config.STORE_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            for statement in _schema():
+                conn.execute(statement)
+            self._add_missing_columns(conn)
+            self._drop_null_keys(conn)
+
+    def _add_missing_columns(self, conn):
+        # Databases created before a column was added to TABLES get it as NULLs,
+        # which the next save fills in
+        for table, spec in TABLES.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for column in spec['columns'].values():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+
+    def _drop_null_keys(self, conn):
+        # Older saves stored undated games with a NULL date in the key, and
+        # SQLite never treats NULL keys as conflicting, so every save added
+        # another copy. They come back (keyed on '') with the next save.
+        for table, spec in TABLES.items():
+            conn.execute(f"DELETE FROM {table} WHERE {' OR '.join(f'{c} IS NULL' for c in spec['key'])}")
+
+    @contextmanager
+    def _connect(self):
+        """
+        Opens a connection for one unit of work and commits it on success
+        """
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert_rows(self, table, rows, school, sport, season):
+        """
+        Writes rows (dicts keyed by the scraper's column names) as the current
+        contents of table for one season. Unchanged rows are left alone,
+        changed rows are updated, rows no longer on the page are removed.
+        rows may be a generator; it is consumed as it is written. Returns the
+        number of rows written or removed.
+        """
+        spec = TABLES[table]
+        columns = list(spec['columns'].values())
+        key = SCOPE + spec['key']
+        all_columns = SCOPE + columns + ['row_order', 'updated_at']
+        value_columns = columns + ['row_order']
+        key_positions = [all_columns.index(c) for c in spec['key']]
+        
+        now = time.time()
+        seen = set()
+        
+        def records():
+            for order, row in enumerate(rows):
+                values = [_sql_value(row.get(c)) for c in spec['columns']]
+                # Key columns are never NULL (e.g. a game with no date yet), or
+                # ON CONFLICT would not match and each save would add a copy
+                for i, column in enumerate(columns):
+                    if values[i] is None and column in spec['key']:
+                        values[i] = ''
+                record = (school, sport, season, *values, order, now)
+                seen.add("\x1f".join(str(record[i]) for i in key_positions))
+                yield record
+        
+        upsert = (
+            f"INSERT INTO {table} ({', '.join(all_columns)}) VALUES ({', '.join('?' * len(all_columns))}) "
+            f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET "
+            f"{', '.join(f'{c} = excluded.{c}' for c in value_columns + ['updated_at'])} "
+            f"WHERE {' OR '.join(f'{table}.{c} IS NOT excluded.{c}' for c in value_columns)}"
+        )
+        
+        with self._write_lock, self._connect() as conn:
+            changed = conn.executemany(upsert, records()).rowcount
+            
+            # Drop rows that disappeared from the page
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen_keys (k TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM seen_keys")
+            conn.executemany("INSERT OR IGNORE INTO seen_keys VALUES (?)", ((k,) for k in seen))
+            key_expr = " || char(31) || ".join(f"COALESCE(CAST({c} AS TEXT), '')" for c in spec['key'])
+            changed += conn.execute(
+                f"DELETE FROM {table} WHERE school = ? AND sport = ? AND season = ? "
+                f"AND {key_expr} NOT IN (SELECT k FROM seen_keys)",
+                (school, sport, season),
+            ).rowcount
+            return changed
+
+    def upsert_table(self, table, df, school, sport, season):
+        """
+        upsert_rows for a DataFrame
+        """
+        rows = [] if df is None or df.empty else df.to_dict(orient='records')
+        return self.upsert_rows(table, rows, school, sport, season)
+
+    def save_stats(self, stats, school, sport, season):
+        if not stats:
+            return 0
+        changed = 0
+        # An empty table means the page failed to parse, not that the season
+        # has no players; upserting it would delete every stored row
+        for table in ('field_players', 'goalies'):
+            if stats.get(table) is not None and not stats[table].empty:
+                changed += self.upsert_table(table, stats[table], school, sport, season)
+        return changed
+
+    def save_dataset(self, data, school=None, sport=None, current=CURRENT_SEASON, previous=PREVIOUS_SEASON):
+        """
+        Persists a scrape_all_data result. Returns the number of changed rows.
+        """
+        school = school or config.SCHOOL
+        sport = sport or config.SPORT
+        changed = self.save_stats(data.get('current_stats'), school, sport, current)
+        changed += self.save_stats(data.get('previous_stats'), school, sport, previous)
+        
+        fixtures = data.get('fixtures')
+        if fixtures and not fixtures['games'].empty:
+            changed += self.upsert_table('games', fixtures['games'], school, sport, current)
+        if data.get('roster') is not None and not data['roster'].empty:
+            changed += self.upsert_table('roster', data['roster'], school, sport, current)
+        
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO datasets VALUES (?, ?, ?, ?, ?)",
+                (school, sport, current, fixtures['coach'] if fixtures else None, time.time()),
+            )
+        return changed
+
+    def load_table(self, table, school=None, sport=None, season=None):
+        """
+        Reads a table back as a DataFrame with the scraper's column names and types.
+        Filters are optional, so this also serves multi-season queries.
+        """
+        spec = TABLES[table]
+        filters = {'school': school, 'sport': sport, 'season': season}
+        where = [f"{c} = ?" for c, v in filters.items() if v is not None]
+        params = [v for v in filters.values() if v is not None]
+        
+        sql_columns = list(spec['columns'].values())
+        extra = [c for c, v in filters.items() if v is None]
+        query = f"SELECT {', '.join(extra + sql_columns)} FROM {table}"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += f" ORDER BY {', '.join(extra + ['row_order'])}"
+        
+        with self._connect() as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+        return apply_schema(df.rename(columns={v: k for k, v in spec['columns'].items()}), table)
+
+    def load_stats(self, school, sport, season):
+        field_players = self.load_table('field_players', school, sport, season)
+        if field_players.empty:
+            return None
+        return {'field_players': field_players, 'goalies': self.load_table('goalies', school, sport, season)}
+
+    def load_dataset(self, school=None, sport=None, current=CURRENT_SEASON, previous=PREVIOUS_SEASON):
+        """
+        Rebuilds the scrape_all_data structure from disk. Returns (data, saved_at),
+        or (None, None) if nothing has been saved yet.
+        """
+        school = school or config.SCHOOL
+        sport = sport or config.SPORT
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT coach, saved_at FROM datasets WHERE school = ? AND sport = ? AND season = ?",
+                (school, sport, current),
+            ).fetchone()
+        if row is None:
+            return None, None
+        coach, saved_at = row
+        
+        data = {
+            'current_stats': self.load_stats(school, sport, current),
+            'previous_stats': self.load_stats(school, sport, previous),
+            'fixtures': {'coach': coach, 'games': self.load_table('games', school, sport, current)},
+            'roster': self.load_table('roster', school, sport, current),
+        }
+        return data, saved_at
+
+    def is_page_done(self, school, sport, season, page):
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT 1 FROM ingest_pages WHERE school = ? AND sport = ? AND season = ? AND page = ?",
+                (school, sport, season, page),
+            ).fetchone() is not None
+
+    def mark_page_done(self, school, sport, season, page):
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ingest_pages VALUES (?, ?, ?, ?, ?)",
+                (school, sport, season, page, time.time()),
+            )
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_stats_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = StatsStore()
+        return _store
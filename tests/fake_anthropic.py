@@ -0,0 +1,86 @@
+"""
+Offline stand-ins for the Anthropic clients, replaying scripted model turns.
+
+A turn is a list of blocks built with text() and tool_use(), plus the stop
+reason and token usage the fake reports for it. FakeClient serves
+messages.create, FakeAsyncClient serves messages.stream; both record the
+keyword arguments of every call.
+"""
+import copy
+from types import SimpleNamespace
+
+
+def text(value):
+    return SimpleNamespace(type="text", text=value)
+
+
+def tool_use(name, input=None, id=None):
+    return SimpleNamespace(type="tool_use", id=id or f"toolu_{name}", name=name, input=input or {})
+
+
+def turn(*blocks, stop_reason=None, input_tokens=100, output_tokens=20):
+    if stop_reason is None:
+        stop_reason = "tool_use" if any(block.type == "tool_use" for block in blocks) else "end_turn"
+    return SimpleNamespace(
+        content=list(blocks),
+        stop_reason=stop_reason,
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens,
+                              cache_creation_input_tokens=0, cache_read_input_tokens=0),
+    )
+
+
+class _Script:
+    def __init__(self, turns):
+        self.turns = list(turns)
+        self.calls = []
+
+    def next(self, kwargs):
+        # Messages are appended to after the call, so keep what was sent
+        self.calls.append(copy.deepcopy(kwargs))
+        if not self.turns:
+            raise AssertionError("the model was called more times than scripted")
+        return self.turns.pop(0)
+
+
+class FakeClient:
+    def __init__(self, *turns):
+        self._script = _Script(turns)
+        self.messages = SimpleNamespace(create=lambda **kwargs: self._script.next(kwargs))
+
+    @property
+    def calls(self):
+        return self._script.calls
+
+
+class _FakeStream:
+    def __init__(self, response):
+        self.response = response
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for block in self.response.content:
+            if block.type == "text":
+                # Deltas word by word, as the real stream splits text
+                words = block.text.split(" ")
+                for i, word in enumerate(words):
+                    yield SimpleNamespace(type="text", text=word if i == len(words) - 1 else word + " ")
+            else:
+                yield SimpleNamespace(type="content_block_start", content_block=block)
+
+    async def get_final_message(self):
+        return self.response
+
+
+class FakeAsyncClient:
+    def __init__(self, *turns):
+        self._script = _Script(turns)
+        self.messages = SimpleNamespace(stream=lambda **kwargs: _FakeStream(self._script.next(kwargs)))
+
+    @property
+    def calls(self):
+        return self._script.calls
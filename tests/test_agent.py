@@ -0,0 +1,187 @@
+import json
+import threading
+
+import pytest
+
+import ai_agent
+import config
+from answer_cache import AnswerCache, TokenBudget
+from fake_anthropic import FakeAsyncClient, FakeClient, text, tool_use, turn
+from fixture_data import frozen_snapshot
+
+
+@pytest.fixture(autouse=True)
+def fresh_agent(monkeypatch):
+    # Answer cache, token budget and tool memo are process-wide
+    monkeypatch.setattr(ai_agent, '_answers', AnswerCache())
+    monkeypatch.setattr(ai_agent, '_budget', TokenBudget(tokens_per_hour=0))
+    monkeypatch.setattr(ai_agent, '_tool_cache', {})
+    monkeypatch.setattr(ai_agent, '_tool_cache_version', None)
+
+
+@pytest.fixture(scope="module")
+def snapshot():
+    return frozen_snapshot()
+
+
+def tool_results(call):
+    return call['messages'][-1]['content']
+
+
+def test_tool_loop_feeds_results_back_until_the_answer(snapshot):
+    client = FakeClient(
+        turn(tool_use("get_top_scorers", {"limit": 1})),
+        turn(text("Leo is top.")),
+    )
+    result = ai_agent.ask("Who is our top scorer?", client=client, snapshot=snapshot)
+
+    assert result == {"answer": "Leo is top.", "cached": False, "truncated": False, "usage": {
+        "input_tokens": 200, "output_tokens": 40, "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}}
+    assert len(client.calls) == 2
+    [block] = tool_results(client.calls[1])
+    assert block['tool_use_id'] == "toolu_get_top_scorers" and block['is_error'] is False
+    assert json.loads(block['content']) == ai_agent.queries.top_scorers(snapshot, 1)
+
+
+def test_tool_calls_in_one_turn_run_concurrently_and_keep_their_order(snapshot, monkeypatch):
+    # Each tool waits for the other, so this only finishes if they run at the same time
+    barrier = threading.Barrier(2, timeout=5)
+
+    def slow(label):
+        def run(snapshot, args):
+            barrier.wait()
+            return {"tool": label}
+        return run
+
+    monkeypatch.setitem(ai_agent.TOOL_FUNCTIONS, "get_team_summary", slow("summary"))
+    monkeypatch.setitem(ai_agent.TOOL_FUNCTIONS, "get_top_scorers", slow("scorers"))
+    results = ai_agent.run_tools(snapshot, [tool_use("get_team_summary", id="a"), tool_use("get_top_scorers", id="b")])
+
+    assert [(r['tool_use_id'], json.loads(r['content'])) for r in results] == [
+        ("a", {"tool": "summary"}), ("b", {"tool": "scorers"})]
+
+
+def test_tool_results_are_memoised_per_snapshot_version(snapshot, monkeypatch):
+    calls = []
+    monkeypatch.setitem(ai_agent.TOOL_FUNCTIONS, "get_top_scorers",
+                        lambda snapshot, args: calls.append(args) or [{"player": "Leo"}])
+
+    for _ in range(3):
+        ai_agent.run_tools(snapshot, [tool_use("get_top_scorers", {"limit": 3})])
+    assert len(calls) == 1
+
+    ai_agent.run_tools(frozen_snapshot(version=snapshot.version + 1), [tool_use("get_top_scorers", {"limit": 3})])
+    assert len(calls) == 2
+
+
+def test_unknown_tool_and_missing_player_are_errors_for_the_model(snapshot):
+    missing, unknown = ai_agent.run_tools(snapshot, [
+        tool_use("get_player_stats", {"player_name": "Nobody Atall"}, id="a"),
+        tool_use("get_weather", id="b"),
+    ])
+    assert missing['is_error'] and unknown['is_error']
+
+
+def test_repeated_question_is_answered_from_cache(snapshot):
+    client = FakeClient(turn(text("Leo is top.")))
+    ai_agent.ask("Who is our top scorer?", client=client, snapshot=snapshot)
+    result = ai_agent.ask("who's the top scorer", client=client, snapshot=snapshot)
+
+    assert result['cached'] is True and result['answer'] == "Leo is top."
+    assert len(client.calls) == 1
+
+
+def test_request_budget_caps_max_tokens_and_stops_the_loop(snapshot, monkeypatch):
+    monkeypatch.setattr(config, 'AGENT_REQUEST_TOKEN_BUDGET', 300)
+    client = FakeClient(
+        turn(tool_use("get_top_scorers"), input_tokens=200, output_tokens=50),
+        turn(tool_use("get_team_summary"), input_tokens=40, output_tokens=10),
+    )
+    result = ai_agent.ask("Compare our scorers", client=client, snapshot=snapshot)
+
+    assert [call['max_tokens'] for call in client.calls] == [min(config.AGENT_MAX_TOKENS, 300), 50]
+    assert ai_agent.spent_tokens(result['usage']) == 300
+    assert result['answer'].startswith("Sorry")
+
+
+def test_hourly_budget_is_charged_and_enforced(snapshot, monkeypatch):
+    monkeypatch.setattr(ai_agent, '_budget', TokenBudget(tokens_per_hour=150))
+    ai_agent.ask("Who is our top scorer?", client=FakeClient(turn(text("Leo."), input_tokens=100, output_tokens=50)),
+                 snapshot=snapshot)
+
+    assert ai_agent._budget.remaining() == 0
+    client = FakeClient()
+    result = ai_agent.ask("How many saves?", client=client, snapshot=snapshot)
+    assert "budget" in result['answer'] and client.calls == []
+
+
+def test_answer_cut_off_by_max_tokens_is_marked_and_not_cached(snapshot):
+    client = FakeClient(
+        turn(text("Leo has 9 goals and"), stop_reason="max_tokens"),
+        turn(text("Leo has 9 goals and 4 assists.")),
+    )
+    first = ai_agent.ask("How is Leo doing?", client=client, snapshot=snapshot)
+    second = ai_agent.ask("How is Leo doing?", client=client, snapshot=snapshot)
+
+    assert first['truncated'] is True and first['answer'] == "Leo has 9 goals and"
+    assert second['cached'] is False and second['truncated'] is False
+    assert second['answer'] == "Leo has 9 goals and 4 assists."
+    assert len(client.calls) == 2
+
+
+def stream(question, client, snapshot):
+    return list(ai_agent.stream_chat_sync(question, client=client, snapshot=snapshot))
+
+
+def streamed_text(events):
+    return "".join(event['text'] for event in events if event['type'] == "text")
+
+
+def test_stream_yields_deltas_and_tool_events_in_order(snapshot):
+    client = FakeAsyncClient(
+        turn(text("Let me check."), tool_use("get_top_scorers", {"limit": 1})),
+        turn(text("Leo is top.")),
+    )
+    events = stream("Who is our top scorer?", client, snapshot)
+
+    assert [event['type'] for event in events] == [
+        "text", "text", "text", "tool_call", "tool_result", "text", "text", "text", "done"]
+    assert events[3] == {"type": "tool_call", "name": "get_top_scorers", "input": {"limit": 1}}
+    assert events[4] == {"type": "tool_result", "name": "get_top_scorers", "is_error": False}
+    assert streamed_text(events) == "Let me check.Leo is top."
+    assert json.loads(tool_results(client.calls[1])[0]['content']) == ai_agent.queries.top_scorers(snapshot, 1)
+
+    done = events[-1]
+    assert done['answer'] == "Leo is top." and done['cached'] is False and done['truncated'] is False
+    assert done['usage']['input_tokens'] == 200 and done['usage']['output_tokens'] == 40
+
+
+def test_stream_caches_only_the_final_turn(snapshot):
+    client = FakeAsyncClient(
+        turn(text("Let me check."), tool_use("get_top_scorers")),
+        turn(text("Leo is top.")),
+    )
+    stream("Who is our top scorer?", client, snapshot)
+
+    # The preamble before the tool call was streamed but is not part of the answer
+    assert ai_agent.ask("Who is our top scorer?", client=FakeClient(), snapshot=snapshot)['answer'] == "Leo is top."
+    events = stream("who's the top scorer", FakeAsyncClient(), snapshot)
+    assert streamed_text(events) == "Leo is top." and events[-1]['cached'] is True
+
+
+def test_stream_stops_when_the_budget_is_spent(snapshot, monkeypatch):
+    monkeypatch.setattr(config, 'AGENT_REQUEST_TOKEN_BUDGET', 300)
+    client = FakeAsyncClient(
+        turn(tool_use("get_top_scorers"), input_tokens=200, output_tokens=50),
+        turn(tool_use("get_team_summary"), input_tokens=40, output_tokens=10),
+    )
+    events = stream("Compare our scorers", client, snapshot)
+
+    assert [call['max_tokens'] for call in client.calls] == [min(config.AGENT_MAX_TOKENS, 300), 50]
+    assert events[-1]['answer'].startswith("Sorry") and ai_agent.spent_tokens(events[-1]['usage']) == 300
+
+    monkeypatch.setattr(ai_agent, '_budget', TokenBudget(tokens_per_hour=300))
+    ai_agent._budget.spend(300)
+    client = FakeAsyncClient()
+    events = stream("How many saves?", client, snapshot)
+    assert "budget" in events[-1]['answer'] and client.calls == []
@@ -0,0 +1,27 @@
+from answer_cache import AnswerCache
+
+
+def test_rewording_reuses_the_answer():
+    cache = AnswerCache()
+    cache.put("Who's our top scorer?", 1, "Leo")
+
+    assert cache.get("who is the top scorers", 1) == "Leo"
+    assert cache.get("Who's our top scorer?", 2) is None
+
+
+def test_extra_words_are_a_different_question():
+    cache = AnswerCache()
+    cache.put("How many goals did Leo Martinez score this season?", 1, "THIS SEASON: 9")
+
+    assert cache.get("How many goals did Leo Martinez score last season?", 1) is None
+    assert cache.get("How many goals did Leo Martinez score in October?", 1) is None
+    assert cache.get("how many goals did leo martinez score", 1) == "THIS SEASON: 9"
+
+
+def test_evicted_answers_are_not_matched_by_content_words():
+    cache = AnswerCache(max_entries=1)
+    cache.put("Who's our top scorer?", 1, "Leo")
+    cache.put("How many saves?", 1, "40")
+
+    assert cache.get("who is the top scorer", 1) is None
+    assert cache.get("how many saves", 1) == "40"
@@ -0,0 +1,89 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import ai_agent
+import api
+import config
+import data_store
+from answer_cache import AnswerCache, TokenBudget
+from data_store import DataStore
+from fake_anthropic import FakeAsyncClient, text, turn
+from fixture_data import load_dataset
+
+
+@pytest.fixture
+def client_with(monkeypatch):
+    """
+    TestClient for api.app with the scheduler off and a store using loader
+    """
+    def make(loader):
+        monkeypatch.setattr(config, 'SCHEDULER_ENABLED', False)
+        monkeypatch.setattr(data_store, '_store', DataStore(loader=loader, stats_store=None, retry_delay=3600))
+        return TestClient(api.app)
+    return make
+
+
+def wait_until(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "background refresh did not finish"
+        time.sleep(0.01)
+
+
+def test_first_request_starts_a_scrape_without_the_scheduler(client_with):
+    with client_with(lambda **kwargs: load_dataset()) as client:
+        assert client.get('/api/team/summary').status_code == 503
+        wait_until(lambda: data_store._store.snapshot is not None)
+
+        response = client.get('/api/team/summary')
+        assert response.status_code == 200
+        assert response.json()['current']['goals'] > 0
+        assert client.get('/api/ready').json()['ready'] is True
+
+
+def test_not_ready_after_a_failed_first_scrape(client_with):
+    calls = []
+
+    def failing(**kwargs):
+        calls.append(1)
+        return {'current_stats': None}
+
+    with client_with(failing) as client:
+        assert client.get('/api/ready').status_code == 503
+        wait_until(lambda: data_store._store.retry_pending)
+
+        assert client.get('/api/ready').status_code == 503
+        assert client.get('/api/team/summary').status_code == 503
+        # Waiting out the retry delay rather than scraping on every request
+        assert len(calls) == 1
+
+
+def test_ambiguous_player_name_is_a_conflict_with_choices(client_with):
+    with client_with(lambda **kwargs: load_dataset()) as client:
+        client.get('/api/ready')
+        wait_until(lambda: data_store._store.snapshot is not None)
+
+        response = client.get('/api/player/Martinez')
+        assert response.status_code == 409
+        assert 'Leo Martinez' in response.json()['detail']['choices']
+        assert client.get('/api/player/Leo%20Martinez').json()['player'] == 'Leo Martinez'
+        assert client.post('/api/batch', json={'players': ['Martinez']}).json()['players'] == {'Martinez': None}
+
+
+def test_chat_stream_is_not_gzipped(client_with, monkeypatch):
+    # Compressed SSE is buffered until the stream ends, so no deltas would arrive
+    answer = "Leo is top. " * 100
+    monkeypatch.setattr(ai_agent, '_answers', AnswerCache())
+    monkeypatch.setattr(ai_agent, '_budget', TokenBudget(tokens_per_hour=0))
+    monkeypatch.setattr(ai_agent, 'get_async_client', lambda: FakeAsyncClient(turn(text(answer))))
+    with client_with(lambda **kwargs: load_dataset()) as client:
+        client.get('/api/ready')
+        wait_until(lambda: data_store._store.snapshot is not None)
+
+        response = client.get('/api/chat/stream', params={'q': 'Who is our top scorer?'},
+                              headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert 'content-encoding' not in response.headers
+        assert 'event: done' in response.text and answer.strip() in response.text
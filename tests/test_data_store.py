@@ -0,0 +1,75 @@
+import time
+
+from data_store import DataStore, Snapshot, has_data
+from fixture_data import load_dataset
+from scraper import parse_stats_page
+
+
+class Loader:
+    """
+    Returns each of results in turn, counting the scrapes
+    """
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self, **kwargs):
+        self.calls += 1
+        return self.results.pop(0)
+
+
+def test_failed_first_scrape_is_not_installed():
+    loader = Loader({}, load_dataset())
+    store = DataStore(loader=loader, retry_delay=3600)
+
+    assert store.refresh() is None
+    assert store.snapshot is None
+    # Within the retry delay get() does not scrape again
+    assert store.get() is None
+    assert loader.calls == 1
+
+
+def test_scrape_is_retried_after_the_delay():
+    loader = Loader({'current_stats': None}, load_dataset())
+    store = DataStore(loader=loader, retry_delay=0)
+
+    assert store.get() is None
+    snapshot = store.get()
+    assert snapshot is not None and snapshot.version == 1
+    assert loader.calls == 2
+
+
+def test_failed_refresh_keeps_the_previous_snapshot():
+    store = DataStore(loader=Loader(load_dataset(), {}))
+    first = store.refresh()
+
+    assert store.refresh() is first
+    assert store.snapshot is first
+
+
+def test_refresh_without_players_keeps_the_previous_snapshot():
+    data = load_dataset()
+    empty = dict(data, current_stats=parse_stats_page("<html><body></body></html>"))
+    store = DataStore(loader=Loader(data, empty))
+    first = store.refresh()
+
+    assert store.refresh() is first
+    assert store.snapshot.version == 1
+
+
+def test_first_scrape_without_players_is_not_installed():
+    empty = dict(load_dataset(), current_stats=parse_stats_page("<html><body></body></html>"))
+    store = DataStore(loader=Loader(empty), retry_delay=3600)
+
+    assert store.refresh() is None
+    assert store.retry_pending
+
+
+def test_snapshot_usable_matches_what_a_refresh_installs():
+    data = load_dataset()
+    empty = dict(data, current_stats=parse_stats_page("<html><body></body></html>"))
+
+    assert has_data(data) and Snapshot(data=data, version=1, created_at=time.time()).usable
+    assert not has_data(empty) and not Snapshot(data=empty, version=1, created_at=time.time()).usable
+    assert not has_data(None) and not has_data({'current_stats': None})
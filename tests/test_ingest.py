@@ -0,0 +1,43 @@
+import threading
+
+import ingest
+from fixture_data import read_fixture
+
+
+class CountingSink:
+    """
+    Records written pages; is_done is always False
+    """
+
+    def __init__(self):
+        self.pages = []
+
+    def is_done(self, task):
+        return False
+
+    def write(self, task, rows):
+        self.pages.append(task)
+        return sum(1 for _ in rows)
+
+
+def test_pages_are_fetched_in_a_bounded_window(monkeypatch):
+    html = read_fixture("roster_2025-2026.html")
+    sink = CountingSink()
+    lock = threading.Lock()
+    fetched = []
+    ahead = []
+
+    def fetch_page(task, timeout=None):
+        with lock:
+            fetched.append(task)
+            # Pages fetched but not written yet
+            ahead.append(len(fetched) - len(sink.pages))
+        return html
+
+    monkeypatch.setattr(ingest, 'fetch_page', fetch_page)
+    seasons = [f"{year}-{year + 1}" for year in range(2000, 2025)]
+    summary = ingest.ingest(['edison-edison'], seasons, pages=['roster'], sink=sink, max_workers=2)
+
+    assert summary['fetched'] == len(seasons) and summary['failed'] == 0
+    assert summary['rows'] == 26 * len(seasons)
+    assert max(ahead) <= 4
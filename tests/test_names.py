@@ -0,0 +1,43 @@
+import pytest
+
+import queries
+from fixture_data import frozen_snapshot
+from names import NameIndex
+
+PLAYERS = ['Brian Martinez', 'Leo Martinez', 'Sam Martinez', 'Chris Lopez', 'Chris Reyes', 'Daniel Kim']
+
+
+@pytest.mark.parametrize("query, name", [
+    ("Leo Martinez", "Leo Martinez"),
+    ("leo  martínez", "Leo Martinez"),
+    ("Lopez", "Chris Lopez"),
+    ("chris lopes", "Chris Lopez"),
+    ("Topher Lopez", "Chris Lopez"),
+    ("Danny Kim", "Daniel Kim"),
+])
+def test_resolves_clear_matches(query, name):
+    assert NameIndex(PLAYERS).resolve(query) == name
+
+
+@pytest.mark.parametrize("query, choices", [
+    ("Martinez", ['Brian Martinez', 'Leo Martinez', 'Sam Martinez']),
+    ("Chris", ['Chris Lopez', 'Chris Reyes']),
+])
+def test_shared_partial_names_are_ambiguous(query, choices):
+    index = NameIndex(PLAYERS)
+    assert index.resolve(query) is None
+    assert index.ambiguous(query) == choices
+
+
+def test_near_tie_on_a_misspelling_is_ambiguous():
+    index = NameIndex(['Jon Smith', 'Jan Smith'])
+    assert index.resolve('Jen Smith') is None
+    assert sorted(index.ambiguous('Jen Smith')) == ['Jan Smith', 'Jon Smith']
+
+
+def test_player_stats_raises_with_the_choices():
+    snapshot = frozen_snapshot()
+    with pytest.raises(queries.AmbiguousName) as raised:
+        queries.player_stats(snapshot, "Martinez")
+    assert len(raised.value.choices) == 5
+    assert queries.player_stats(snapshot, "Leo Martinez")['player'] == "Leo Martinez"
@@ -0,0 +1,67 @@
+import sqlite3
+
+import pandas as pd
+
+from fixture_data import load_dataset
+from scraper import parse_stats_page
+from schema import typed_frame
+from store import StatsStore
+
+SCOPE = ('edison-edison', 'boyssoccer', '2025-2026')
+
+
+def games_frame():
+    return typed_frame([
+        {'Date': pd.Timestamp('2025-09-04'), 'Opponent': 'Woodbridge', 'Location': 'Home', 'Result': 'W 2-1',
+         'Outcome': 'W', 'Goals For': 2, 'Goals Against': 1, 'Record': '1-0'},
+        # Not scheduled yet, so there is no date to key on
+        {'Date': None, 'Opponent': 'Piscataway', 'Location': 'Away', 'Result': '—',
+         'Outcome': '—', 'Goals For': None, 'Goals Against': None, 'Record': '—'},
+    ], 'games')
+
+
+def test_saving_the_same_games_twice_changes_nothing(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.db"))
+    games = games_frame()
+
+    assert store.upsert_table('games', games, *SCOPE) == 2
+    assert store.upsert_table('games', games, *SCOPE) == 0
+    assert store.upsert_table('games', games, *SCOPE) == 0
+
+    loaded = store.load_table('games', *SCOPE)
+    assert list(loaded['Opponent']) == ['Woodbridge', 'Piscataway']
+    assert pd.isna(loaded['Date'].iloc[1])
+
+
+def test_undated_game_is_removed_when_it_leaves_the_page(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.db"))
+    games = games_frame()
+    store.upsert_table('games', games, *SCOPE)
+
+    assert store.upsert_table('games', games.iloc[:1], *SCOPE) == 1
+    assert list(store.load_table('games', *SCOPE)['Opponent']) == ['Woodbridge']
+
+
+def test_null_keyed_copies_from_older_saves_are_dropped(tmp_path):
+    path = str(tmp_path / "stats.db")
+    StatsStore(path)
+    with sqlite3.connect(path) as conn:
+        for _ in range(3):
+            conn.execute("INSERT INTO games (school, sport, season, date, opponent) VALUES (?, ?, ?, NULL, ?)",
+                         (*SCOPE, 'Piscataway'))
+
+    store = StatsStore(path)
+    store.upsert_table('games', games_frame(), *SCOPE)
+    assert list(store.load_table('games', *SCOPE)['Opponent']) == ['Woodbridge', 'Piscataway']
+
+
+def test_empty_stats_page_keeps_the_stored_players(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.db"))
+    data = load_dataset()
+    store.save_dataset(data)
+
+    # A layout change on nj.com parses to empty tables
+    broken = dict(data, current_stats=parse_stats_page("<html><body></body></html>"))
+    assert store.save_dataset(broken) == 0
+    assert len(store.load_table('field_players', *SCOPE)) == len(data['current_stats']['field_players'])
+    assert len(store.load_table('goalies', *SCOPE)) == len(data['current_stats']['goalies'])